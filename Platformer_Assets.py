@@ -0,0 +1,240 @@
+# Platformer Assets
+
+# Imports required modules
+import os
+import json
+import pygame
+import weakref
+import concurrent.futures
+# Imports settings file
+from Platformer_Settings import *
+
+def animation_files(name, count):
+    """Returns the file names of an animations frames (name_1.png to name_count.png)"""
+    return [name + "_" + str(frame) + ".png" for frame in range(1, count + 1)]
+
+# Files used by the levels and the town, so they can be loaded before they are needed
+LEVEL_IMAGES = (["key_1.png", "key_empty.png", "key_full.png", "tunnel_closed.png", "tunnel_open.png", "door_closed.png", "door_open.png", "jump_pad_1.png", "jump_pad_2.png",
+                 "fly_right_dead.png", "fly_left_dead.png", "heart_full.png", "heart_half.png", "heart_empty.png", "gold_coin.png", "arrow_right.png", "arrow_left.png", "orc_dead_1.png"]
+                + animation_files("fly_right", 2) + animation_files("fly_left", 2) + animation_files("hero_walking_right", 9) + animation_files("hero_walking_left", 9) + animation_files("hero_standing", 7)
+                + animation_files("hero_bow_left", 13) + animation_files("hero_bow_right", 13) + animation_files("coin", 6) + animation_files("orc_walking_left", 9) + animation_files("orc_walking_right", 9))
+LEVEL_TILES = ["spikes.png", "grass_1.png", "grass_2.png", "grass_3.png", "half.png", "dirt.png", "water.png"] + animation_files("lava", 3)
+LEVEL_SOUNDS = ["jump_1.wav", "jump_2.wav", "hit.wav", "dead.wav", "coin_sound.wav"]
+TOWN_IMAGES = ["town_door_open.png", "town_door_closed.png", "building_door_closed.png", "building_door_open.png"] + animation_files("hero_walking_up", 9) + animation_files("hero_walking_down", 9)
+TOWN_TILES = (["town_grass.png", "roof_f.png", "roof_m.png", "roof_b.png", "roof_tile.png", "door_frame.png"] + animation_files("bush", 3)
+              + ["water_" + part + ".png" for part in ("tl", "tm", "tr", "ml", "mm", "mr", "bl", "bm", "br")]
+              + ["dirt_" + part + ".png" for part in ("tl", "tm", "tr", "ml", "mm", "mr", "bl", "bm", "br")])
+TOWN_SOUNDS = ["Footsteps.wav"]
+
+def stamp(filename):
+    """Returns the size and modification time of a file (None if it is missing), used to tell if a file changed after it was packed or bundled"""
+    try:
+        status = os.stat(filename)
+    except OSError:
+        return None
+    return [status.st_size, status.st_mtime_ns]
+
+class Silent_Sound():
+    """Sound that does nothing, used when the game runs without audio"""
+    def play(self):
+        """Does not play anything"""
+        return None
+
+class Pooled_Sound():
+    """Shared sound that limits how many copies of it play at once"""
+    def __init__(self, sound, channel=None):
+        """Initiates the pooled sound"""
+        self.sound = sound
+        self.channel = channel # Reserved channel number, or None to play on any free channel
+
+    def play(self):
+        """Plays the sound, returns the channel it plays on (None if it was skipped)"""
+        # Sounds on a reserved channel cut off whatever that channel was playing
+        if self.channel != None:
+            channel = pygame.mixer.Channel(self.channel)
+        # Enough copies are already playing
+        elif self.sound.get_num_channels() >= SOUND_LIMIT:
+            return None
+        else:
+            channel = pygame.mixer.find_channel() # Free channel that is not reserved
+            if channel == None:
+                return None
+        channel.play(self.sound)
+        return channel
+
+class Assets():
+    """Asset registry, every image file is only loaded from disk once and then shared"""
+    def __init__(self):
+        """Initiates the asset registry"""
+        self.images = {} # Loaded images (file name: surface)
+        self.tiles = set() # Images only used by static tiles
+        self.atlas = {} # Images packed into atlas pages (file name: page file name, area)
+        self.pages = {} # Loaded atlas pages (file name: surface)
+        self.bundled = {} # Images and sounds read from the asset bundle (file name: surface or sound)
+        self.bundle = None # Memory map of the asset bundle, kept open while its images are used
+        self.scaled_images = {} # Resized images (file name, size: surface)
+        self.masks = weakref.WeakKeyDictionary() # Collision masks (surface: mask)
+        self.sounds = {} # Loaded sounds (file name: sound)
+        self.pooled_sounds = {} # Sounds shared by the sprites (file name, channel: pooled sound)
+        self.silent = False # Sounds are not loaded or played (headless mode)
+        self.silent_sound = Silent_Sound()
+        self.worker = None # Thread that decodes files ahead of time
+        self.hits = 0
+        self.misses = 0
+
+    def image(self, filename):
+        """Returns the shared surface for an image file"""
+        # Image has already been loaded
+        if filename in self.images:
+            self.hits += 1
+        # First time the image is used
+        else:
+            self.misses += 1
+            self.images[filename] = self.load(filename)
+            self.mask(self.images[filename]) # Mask is ready before any sprite collides with the image
+        return self.images[filename]
+
+    def load(self, filename):
+        """Loads an image in the display windows pixel format, from the asset bundle or its atlas page if it is in one"""
+        if filename in self.bundled:
+            # Bundled images use the bundles pixels, except static tiles that are copied out so they can be run length encoded
+            if filename in self.tiles and RLE_TILES:
+                return self.convert(self.bundled[filename].copy(), True)
+            return self.bundled[filename]
+        if filename not in self.atlas:
+            return self.convert(pygame.image.load(filename), filename in self.tiles)
+        page, area = self.atlas[filename]
+        if page not in self.pages:
+            self.pages[page] = self.convert(pygame.image.load(page))
+        # Packed images share the pages pixels, except static tiles that are copied out so they can be run length encoded
+        if filename in self.tiles and RLE_TILES:
+            return self.convert(self.pages[page].subsurface(area).copy(), True)
+        return self.pages[page].subsurface(area)
+
+    def load_atlas(self, index=ATLAS_INDEX):
+        """Reads an atlas index, so the images in it are sliced out of a few pages instead of loaded one by one
+        Returns False if there is no atlas (images are then loaded from their own files, as are images changed since the atlas was built)"""
+        if not os.path.exists(index):
+            return False
+        with open(index) as file:
+            atlas = json.load(file)
+        folder = os.path.dirname(index)
+        sources = atlas.get("sources", {})
+        for filename in atlas["frames"]:
+            # Images that changed since they were packed are loaded from their own file (the atlas is kept if the file is gone)
+            if stamp(filename) not in (None, sources.get(filename)):
+                continue
+            page, x, y, width, height = atlas["frames"][filename]
+            self.atlas[filename] = (os.path.join(folder, atlas["pages"][page]), pygame.Rect(x, y, width, height))
+        return True
+
+    def scaled(self, filename, size):
+        """Returns the shared surface for an image file resized to a fixed size"""
+        # Image has already been resized
+        if (filename, size) in self.scaled_images:
+            self.hits += 1
+        # First time the image is used at this size
+        else:
+            self.misses += 1
+            self.scaled_images[(filename, size)] = pygame.transform.scale(self.image(filename), size)
+            self.mask(self.scaled_images[(filename, size)])
+        return self.scaled_images[(filename, size)]
+
+    def tile(self, filename):
+        """Returns the shared surface for an image that is only used by static tiles"""
+        self.tiles.add(filename)
+        return self.image(filename)
+
+    def sound(self, filename, channel=None):
+        """Returns the shared sound for a sound file (played on a reserved channel if one is given), or a silent sound when sounds are turned off"""
+        if self.silent:
+            return self.silent_sound
+        # Each sound file is only decoded once
+        if filename in self.sounds:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.sounds[filename] = self.bundled.get(filename) or pygame.mixer.Sound(filename)
+        if (filename, channel) not in self.pooled_sounds:
+            self.pooled_sounds[(filename, channel)] = Pooled_Sound(self.sounds[filename], channel)
+        return self.pooled_sounds[(filename, channel)]
+
+    def reserve_channels(self):
+        """Sets up the mixer channels, the heros channel is kept free from every other sound"""
+        pygame.mixer.set_num_channels(SOUND_CHANNELS)
+        pygame.mixer.set_reserved(HERO_CHANNEL + 1)
+
+    def prefetch(self, images=(), tiles=(), sounds=()):
+        """Starts decoding files that have not been loaded yet on a worker thread, returns a future for finish_prefetch"""
+        self.tiles.update(tiles)
+        images = [filename for filename in list(images) + list(tiles) if filename not in self.images and filename not in self.bundled]
+        # Packed images are sliced out of their page once it has been decoded
+        images = list(dict.fromkeys(self.atlas[filename][0] if filename in self.atlas else filename for filename in images))
+        images = [filename for filename in images if filename not in self.pages]
+        sounds = [filename for filename in sounds if filename not in self.sounds and filename not in self.bundled and not self.silent]
+        if self.worker == None:
+            self.worker = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        return self.worker.submit(self.decode, images, sounds)
+
+    def decode(self, images, sounds):
+        """Decodes image and sound files (runs on the worker thread)"""
+        # Images are converted to the display windows pixel format later, on the main thread
+        return [(filename, pygame.image.load(filename)) for filename in images], [(filename, pygame.mixer.Sound(filename)) for filename in sounds]
+
+    def finish_prefetch(self, future):
+        """Waits for the worker thread to finish decoding, then adds the files to the registry"""
+        images, sounds = future.result()
+        pages = set(page for page, area in self.atlas.values())
+        for filename, surface in images:
+            if filename in pages:
+                if filename not in self.pages:
+                    self.pages[filename] = self.convert(surface)
+            elif filename not in self.images:
+                self.images[filename] = self.convert(surface, filename in self.tiles)
+                self.mask(self.images[filename])
+        for filename, sound in sounds:
+            if filename not in self.sounds:
+                self.sounds[filename] = sound
+
+    def convert(self, surface, tile=False):
+        """Converts a surface to the display windows pixel format"""
+        # The pixel format is unknown until the display window has been created
+        if pygame.display.get_surface() == None:
+            return surface
+        # Image has transparent pixels
+        if surface.get_flags() & pygame.SRCALPHA or surface.get_colorkey() != None:
+            surface = surface.convert_alpha()
+            # Static tiles are never drawn onto, so they can be run length encoded
+            if tile and RLE_TILES:
+                surface.set_alpha(255, pygame.RLEACCEL)
+        # Image is fully opaque
+        else:
+            surface = surface.convert()
+        return surface
+
+    def convert_images(self):
+        """Converts every loaded image, used once the display window has been created"""
+        for page in self.pages:
+            self.pages[page] = self.convert(self.pages[page])
+        for filename in self.images:
+            # Bundled images are already converted, packed images are sliced again from their converted page
+            if filename in self.bundled or filename in self.atlas:
+                self.images[filename] = self.load(filename)
+            else:
+                self.images[filename] = self.convert(self.images[filename], filename in self.tiles)
+            self.mask(self.images[filename])
+        # Resized images are made again from the converted images
+        self.scaled_images = {}
+
+    def mask(self, surface):
+        """Returns the shared collision mask for a surface"""
+        # Masks are only created once for every image (and freed along with the image)
+        if surface not in self.masks:
+            self.masks[surface] = pygame.mask.from_surface(surface)
+        return self.masks[surface]
+
+    def stats(self):
+        """Returns how often the registry was used"""
+        return {"hits": self.hits, "misses": self.misses, "images": len(self.images) + len(self.scaled_images), "sounds": len(self.sounds)}
+
+assets = Assets() # Registry shared by every sprite
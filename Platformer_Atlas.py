@@ -0,0 +1,71 @@
+# Platformer texture atlas packer
+
+# Imports required modules
+import os
+import pygame
+import json
+import argparse
+# Imports other game files
+from Platformer_Settings import *
+from Platformer_Assets import *
+
+def pack(sizes, width=ATLAS_SIZE, height=ATLAS_SIZE):
+    """Places images onto pages in rows (shelves), tallest images first
+    Sizes are the (width, height) of every image (file name: size), returns where each image goes (file name: page, x, y, width, height) and the size of each page"""
+    frames = {}
+    pages = []
+    x = y = shelf = 0 # Position on the current shelf and the current shelfs height
+    for filename in sorted(sizes, key=lambda filename: (-sizes[filename][1], -sizes[filename][0], filename)):
+        image_width, image_height = sizes[filename]
+        if image_width + ATLAS_PADDING > width or image_height + ATLAS_PADDING > height:
+            raise ValueError(filename + " is bigger than an atlas page")
+        # Starts a new shelf when the image does not fit on the end of the current one
+        if x + image_width + ATLAS_PADDING > width:
+            x = 0
+            y += shelf
+            shelf = 0
+        # Starts a new page when the shelf does not fit on the current page
+        if not pages or y + image_height + ATLAS_PADDING > height:
+            pages.append([0, 0])
+            x = y = shelf = 0
+        frames[filename] = (len(pages) - 1, x, y, image_width, image_height)
+        x += image_width + ATLAS_PADDING
+        shelf = max(shelf, image_height + ATLAS_PADDING)
+        # Pages are only as big as the images on them
+        pages[-1] = [max(pages[-1][0], x), max(pages[-1][1], y + shelf)]
+    return frames, pages
+
+def build(filenames, index=ATLAS_INDEX):
+    """Packs images into atlas pages (PNG files) and saves where each image is to an index (JSON file)"""
+    # Images are converted the same way the game converts them, which needs a display window
+    if pygame.display.get_surface() == None:
+        pygame.display.set_mode((1, 1), pygame.HIDDEN)
+    images = dict((filename, pygame.image.load(filename).convert_alpha()) for filename in filenames)
+    frames, sizes = pack(dict((filename, images[filename].get_size()) for filename in images))
+    name = index.rsplit(".", 1)[0]
+    pages = [pygame.Surface(size, pygame.SRCALPHA) for size in sizes]
+    for filename in images:
+        page, x, y, width, height = frames[filename]
+        # Pages start fully transparent, so this copies the pixels exactly (alpha included)
+        pages[page].blit(images[filename], (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+    page_files = []
+    for number, page in enumerate(pages):
+        page_files.append("%s_%d.png" % (name, number + 1))
+        pygame.image.save(page, page_files[-1])
+    with open(index, "w") as file:
+        # Pages are found next to the index, wherever it is moved to
+        page_files = [os.path.basename(page) for page in page_files]
+        # Size and modification time of every image, so images changed after the atlas was built are not taken from it
+        sources = dict((filename, stamp(filename)) for filename in images)
+        json.dump({"pages": page_files, "frames": frames, "sources": sources}, file, separators=(",", ":"), sort_keys=True)
+    return page_files
+
+# Builds the atlas when the file is run
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Packs the games images into a few atlas pages, run again whenever an image changes")
+    parser.add_argument("images", nargs="*", help="images to pack (defaults to every image the levels and the town use)")
+    parser.add_argument("--index", default=ATLAS_INDEX, help="index file to save, the pages are saved next to it")
+    arguments = parser.parse_args()
+    images = arguments.images or list(dict.fromkeys(LEVEL_IMAGES + LEVEL_TILES + TOWN_IMAGES + TOWN_TILES))
+    for page in build(images, arguments.index):
+        print("Saved " + page)
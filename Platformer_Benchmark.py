@@ -0,0 +1,155 @@
+# Platformer Benchmark
+
+# Imports required modules
+import time
+import json
+import argparse
+import tracemalloc
+# Imports other game files
+from Platformer_Main import *
+from Platformer_Generator import *
+
+def percentile(timings, percent):
+    """Returns the timing that the given percent of timings are below"""
+    timings = sorted(timings)
+    return timings[min(len(timings) - 1, int(len(timings) * percent / 100))]
+
+def result(timings):
+    """Turns a list of timings (milliseconds) into frames per second and percentiles"""
+    average = sum(timings) / len(timings)
+    return {"fps": 1000 / average if average > 0 else 0, "p50": percentile(timings, 50), "p99": percentile(timings, 99), "samples": len(timings)}
+
+def time_frames(function, frames):
+    """Times a function that is called once per frame"""
+    timings = []
+    for frame in range(frames):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+def new_game(level=1, tiles=None):
+    """Creates a headless game with the same random numbers every time"""
+    game = Game(headless=True, seed=0)
+    game.difficulty = "god" # Hero can not die, so every frame is played
+    game.load_level(level, tiles)
+    return game
+
+def frame(game):
+    """One full frame (a fixed update followed by drawing)"""
+    game.update()
+    game.paint()
+
+def add_orcs(game, count):
+    """Spawns orcs at random empty map cells"""
+    empty = [(column, row) for row in range(game.map.tile_height) for column in range(game.map.tile_width) if game.map.code(column, row) == 0]
+    for column, row in game.random.sample(empty, min(count, len(empty))):
+        game.orc_pool.get(column, row, None)
+
+def add_coins(game):
+    """Fills every empty map cell with a coin"""
+    for row in range(game.map.tile_height):
+        for column, code in enumerate(game.map.row(row)):
+            if code == 0:
+                Coin(column, row, game)
+
+def keep_arrows(game, count):
+    """Shoots arrows until there are the given number of arrows in the air"""
+    while len(game.arrows) < count:
+        game.arrow_pool.get(game.random.choice(["r", "l"]))
+
+def run(frames, loads):
+    """Runs every benchmark, returns the results (case: result)"""
+    results = {}
+    game = new_game()
+    # Building each level
+    for level in range(1, len(tile_map) + 1):
+        results["load level %d" % level] = result(time_frames(lambda: game.load_level(level), loads))
+    # Building the town
+    results["load town"] = result(time_frames(lambda: Town(game).load(), loads))
+
+    # Steady state updates and drawing
+    game = new_game()
+    time_frames(lambda: frame(game), frames // 10) # Warms up the caches
+    results["update"] = result(time_frames(game.update, frames))
+    results["paint"] = result(time_frames(game.paint, frames))
+    results["frame"] = result(time_frames(lambda: frame(game), frames))
+
+    # Stress scenarios
+    game = new_game()
+    add_orcs(game, 50)
+    results["50 orcs"] = result(time_frames(lambda: frame(game), frames))
+    game = new_game()
+    results["5 arrows"] = result(time_frames(lambda: (keep_arrows(game, 5), frame(game)), frames))
+    game = new_game()
+    add_coins(game)
+    results["coin field"] = result(time_frames(lambda: frame(game), frames))
+    return results
+
+def run_generated(width, height, frames, loads):
+    """Runs the benchmarks on a generated map, to see how the game scales with map size"""
+    results = {}
+    size = "%dx%d" % (width, height)
+    tiles = generate(width, height, seed=0)
+    game = new_game(1, tiles)
+    results["load " + size] = result(time_frames(lambda: game.load_level(1, tiles), loads))
+    # Memory used by a built level (Python objects only, surface pixels are not counted)
+    game.load_level(1) # Frees the generated level first
+    tracemalloc.start()
+    game.load_level(1, tiles)
+    results["load " + size]["memory"] = tracemalloc.get_traced_memory()[0] / 1048576
+    tracemalloc.stop()
+    time_frames(lambda: frame(game), frames // 10)
+    results["frame " + size] = result(time_frames(lambda: frame(game), frames))
+    return results
+
+def report(results, baseline=None):
+    """Prints the results, compared with the baseline results if there are any"""
+    print("%-16s %10s %10s %10s %10s" % ("case", "fps", "p50 ms", "p99 ms", "p50 change"))
+    for case in results:
+        row = results[case]
+        change = ""
+        if baseline != None and case in baseline and baseline[case]["p50"] > 0:
+            change = "%+.1f%%" % ((row["p50"] / baseline[case]["p50"] - 1) * 100)
+        print("%-16s %10.1f %10.3f %10.3f %10s" % (case, row["fps"], row["p50"], row["p99"], change))
+        if "memory" in row:
+            print("%-16s %10.1f MB" % ("", row["memory"]))
+
+def slower(results, baseline, tolerance):
+    """Returns the cases whose median time is more than tolerance percent slower than the baseline"""
+    return [case for case in results if case in baseline and results[case]["p50"] > baseline[case]["p50"] * (1 + tolerance / 100)]
+
+def main(frames=500, loads=20, save=None, baseline=None, tolerance=None, sizes=()):
+    """Runs the benchmarks, returns False if a case got slower than the tolerance allows
+    Sizes are the (width, height) of generated maps to also run the benchmarks on"""
+    results = run(frames, loads)
+    for width, height in sizes:
+        results.update(run_generated(width, height, frames, loads))
+    if baseline != None:
+        with open(baseline) as file:
+            baseline = json.load(file)
+    report(results, baseline)
+    if save != None:
+        with open(save, "w") as file:
+            json.dump(results, file, indent=2)
+    pygame.quit()
+    if baseline != None and tolerance != None:
+        cases = slower(results, baseline, tolerance)
+        for case in cases:
+            print(case + " is slower than the baseline")
+        return not cases
+    return True
+
+# Only runs the benchmarks when the file is run
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Times level loading, updating and drawing without a window")
+    parser.add_argument("--frames", type=int, default=500, help="frames timed for each update and drawing case")
+    parser.add_argument("--loads", type=int, default=20, help="times each level is built")
+    parser.add_argument("--save", help="saves the results to a JSON file")
+    parser.add_argument("--baseline", help="compares the results with a saved JSON file")
+    parser.add_argument("--tolerance", type=float, help="fails if a median time is this many percent slower than the baseline")
+    parser.add_argument("--generate", action="append", default=[], metavar="WIDTHxHEIGHT", help="also benchmarks a generated map of this size (can be repeated)")
+    arguments = parser.parse_args()
+    sizes = [tuple(int(number) for number in size.lower().split("x")) for size in arguments.generate]
+    if not main(arguments.frames, arguments.loads, arguments.save, arguments.baseline, arguments.tolerance, sizes):
+        raise SystemExit(1)
@@ -0,0 +1,105 @@
+# Platformer asset bundle
+
+# Imports required modules
+import os
+import sys
+import mmap
+import json
+import struct
+import argparse
+import pygame
+# Imports other game files
+from Platformer_Settings import *
+from Platformer_Assets import *
+from Platformer_Level import *
+from Platformer_Map import *
+import Platformer_Map
+
+# Bundle header (name, version, size of the JSON index that follows it)
+BUNDLE_HEADER = struct.Struct("<4sBI")
+
+def pixel_format(surface):
+    """Returns the order of the bytes in a surfaces pixels (e.g. "BGRA"), so pixels can be saved and used again without converting them"""
+    masks = surface.get_masks()
+    shifts = range(4) if sys.byteorder == "little" else range(3, -1, -1)
+    return "".join("RGBA"[masks.index(255 << (8 * shift))] for shift in shifts)
+
+def build(filename=BUNDLE_FILE):
+    """Saves every image (as pixels in the display windows format), sound (as samples in the mixers format) and map (as a compiled level) to one file"""
+    pygame.init()
+    if pygame.display.get_surface() == None:
+        pygame.display.set_mode((1, 1), pygame.HIDDEN)
+    if pygame.mixer.get_init() == None:
+        pygame.mixer.init()
+    data = bytearray()
+    # Every source file is stamped, so files changed after the bundle was built are loaded from the file instead
+    index = {"images": {}, "sounds": {}, "maps": {}, "mixer": pygame.mixer.get_init(), "sources": {"maps": stamp(Platformer_Map.__file__)}}
+    def add(chunk):
+        """Adds a chunk of data, returns where it starts"""
+        data.extend(bytes(-len(data) % 8)) # Every chunk starts on an 8 byte boundary
+        offset = len(data)
+        data.extend(chunk)
+        return offset
+    for image in dict.fromkeys(LEVEL_IMAGES + LEVEL_TILES + TOWN_IMAGES + TOWN_TILES):
+        surface = pygame.image.load(image).convert_alpha()
+        index["format"] = pixel_format(surface)
+        index["sources"][image] = stamp(image)
+        index["images"][image] = [add(pygame.image.tobytes(surface, index["format"]))] + list(surface.get_size())
+    for sound in dict.fromkeys(LEVEL_SOUNDS + TOWN_SOUNDS):
+        samples = pygame.mixer.Sound(sound).get_raw()
+        index["sources"][sound] = stamp(sound)
+        index["sounds"][sound] = [add(samples), len(samples)]
+    # Town is level 0
+    for level, tiles in enumerate([town_map] + tile_map):
+        packed = pack_level(tiles)
+        index["maps"][level] = [add(packed), len(packed)]
+    encoded = json.dumps(index).encode("utf-8")
+    encoded += b" " * (-(BUNDLE_HEADER.size + len(encoded)) % 8) # Data starts on an 8 byte boundary
+    with open(filename, "wb") as file:
+        file.write(BUNDLE_HEADER.pack(b"ABJB", 1, len(encoded)))
+        file.write(encoded)
+        file.write(data)
+
+def load_bundle(filename=BUNDLE_FILE):
+    """Memory maps the asset bundle, so images, sounds and maps are used straight from it instead of being decoded
+    Returns False if there is no bundle, files that changed since it was built or were saved in a different format are loaded from their own files instead"""
+    if not os.path.exists(filename):
+        return False
+    # Bundle is only read once, however many games are created
+    if assets.bundle != None:
+        return True
+    with open(filename, "rb") as file:
+        # Copy on write, so surfaces can use the mapped pixels without the file ever changing
+        bundle = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+    name, version, size = BUNDLE_HEADER.unpack_from(bundle)
+    if name != b"ABJB" or version != 1:
+        raise ValueError(filename + " is not an asset bundle")
+    index = json.loads(bundle[BUNDLE_HEADER.size:BUNDLE_HEADER.size + size])
+    data = memoryview(bundle)[BUNDLE_HEADER.size + size:]
+    sources = index.get("sources", {})
+    def fresh(name, filename):
+        """Checks that a file has not changed since the bundle was built"""
+        return name in sources and sources[name] == stamp(filename)
+    # Surfaces use the bundles pixels directly, which only works if they are already in the display windows format
+    if pygame.display.get_surface() != None and index["format"] == pixel_format(pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha()):
+        for image in [image for image in index["images"] if fresh(image, image)]:
+            offset, width, height = index["images"][image]
+            assets.bundled[image] = pygame.image.frombuffer(data[offset:offset + width * height * 4], (width, height), index["format"])
+    if not assets.silent and pygame.mixer.get_init() == tuple(index["mixer"]):
+        for sound in [sound for sound in index["sounds"] if fresh(sound, sound)]:
+            offset, length = index["sounds"][sound]
+            assets.bundled[sound] = pygame.mixer.Sound(buffer=data[offset:offset + length])
+    if fresh("maps", Platformer_Map.__file__):
+        for level in index["maps"]:
+            offset, length = index["maps"][level]
+            bundled_maps[int(level)] = unpack_level(data[offset:offset + length], filename)
+    assets.bundle = bundle
+    return True
+
+# Builds the bundle when the file is run
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Saves the games images, sounds and maps to one file that loads without decoding, run again whenever one of them changes")
+    parser.add_argument("--output", default=BUNDLE_FILE, help="bundle file to save")
+    arguments = parser.parse_args()
+    build(arguments.output)
+    print("Saved " + arguments.output)
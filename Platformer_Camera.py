@@ -2,37 +2,155 @@
 
 # Imports required modules
 import pygame
+import re
+from array import array
 # Imports other game files
 from Platformer_Settings import *
 from Platformer_Map import *
+from Platformer_Level import *
 
 class Map():
     """Map object"""
     def __init__(self, level):
-        """Initializes Map and creates map list"""
-        self.tile_map = []
-        # Creates map for desired level
-        for line in tile_map[level - 1]:
-            self.tile_map.append(line)
-    
-        self.tile_width = len(self.tile_map[0])
-        self.tile_height = len(self.tile_map)
+        """Initializes Map and creates the tile code array
+        Level is a level number (0 is the town), a tile map (e.g. from Platformer_Generator) or a level file name"""
+        # Tile codes are stored row by row
+        if isinstance(level, int) and level in bundled_maps:
+            width, height, codes = bundled_maps[level]
+            self.tile_width, self.tile_height, self.codes = width, height, array("B", codes)
+        elif isinstance(level, int):
+            self.tile_width, self.tile_height, self.codes = pack_tiles(tile_map[level - 1] if level > 0 else town_map)
+        elif isinstance(level, str):
+            self.tile_width, self.tile_height, self.codes = read_level(level)
+        else:
+            self.tile_width, self.tile_height, self.codes = pack_tiles(level)
         self.width = self.tile_width * TILE_SIZE
         self.height = self.tile_height * TILE_SIZE
 
-class Town_Map():
+    def code(self, column, row):
+        """Returns the tile code at a map cell"""
+        return self.codes[row * self.tile_width + column]
+
+    def tile(self, column, row):
+        """Returns the tile name at a map cell"""
+        return tile_names[self.code(column, row)]
+
+    def row(self, row):
+        """Returns the tile codes of a row"""
+        return self.codes[row * self.tile_width:(row + 1) * self.tile_width]
+
+    def tiles(self):
+        """Yields the column, row and name of every tile that is not empty (row by row)"""
+        for index, code in enumerate(self.codes):
+            if code != 0:
+                yield index % self.tile_width, index // self.tile_width, tile_names[code]
+
+    def find(self, names):
+        """Yields the column, row and name of every tile with one of the names (row by row)"""
+        codes = bytes(tile_codes[name] for name in names if name in tile_codes)
+        if codes:
+            # Searches the codes without looking at every tile in Python
+            for match in re.finditer(b"[" + re.escape(codes) + b"]", self.codes.tobytes()):
+                index = match.start()
+                yield index % self.tile_width, index // self.tile_width, tile_names[self.codes[index]]
+
+class Town_Map(Map):
     """Town object"""
     def __init__(self):
-        """Initiates Town and creates town list"""
-        self.tile_town = []
-        # Creates town
-        for line in town_map:
-            self.tile_town.append(line)
-        
-        self.tile_width = len(self.tile_town[0])
-        self.tile_height = len(self.tile_town)
-        self.width = self.tile_width * TILE_SIZE
-        self.height = self.tile_height * TILE_SIZE
+        """Initiates Town and creates the tile code array"""
+        # Inherits from the map class
+        super().__init__(0) # Town is level 0
+
+class Tile_Grid():
+    """Environment blocks indexed by the map cells they cover, used for collisions"""
+    def __init__(self, map):
+        """Initiates the grid for a map"""
+        self.tile_width = map.tile_width
+        self.tile_height = map.tile_height
+        self.cells = {} # Blocks in each cell (column, row: list of blocks)
+        self.order = {} # Map position of the blocks, so collisions are sorted the same way the level adds them
+
+    def add(self, sprites):
+        """Adds sprites to every cell their rect covers"""
+        for sprite in sprites:
+            self.order[sprite] = (sprite.rect.top, sprite.rect.left)
+            for column in range(sprite.rect.left // TILE_SIZE, (sprite.rect.right - 1) // TILE_SIZE + 1):
+                for row in range(sprite.rect.top // TILE_SIZE, (sprite.rect.bottom - 1) // TILE_SIZE + 1):
+                    self.cells.setdefault((column, row), []).append(sprite)
+
+    def remove(self, sprites):
+        """Removes sprites from every cell they were added to"""
+        for sprite in sprites:
+            del self.order[sprite]
+            for column in range(sprite.rect.left // TILE_SIZE, (sprite.rect.right - 1) // TILE_SIZE + 1):
+                for row in range(sprite.rect.top // TILE_SIZE, (sprite.rect.bottom - 1) // TILE_SIZE + 1):
+                    cell = self.cells[(column, row)]
+                    cell.remove(sprite)
+                    if not cell:
+                        del self.cells[(column, row)]
+
+    def collide(self, sprite, collided=None):
+        """Returns the blocks that collide with a sprite (works like pygame.sprite.spritecollide)"""
+        rect = sprite.rect
+        collisions = []
+        # Only the cells the sprite covers are checked
+        for column in range(rect.left // TILE_SIZE, (rect.right - 1) // TILE_SIZE + 1):
+            for row in range(rect.top // TILE_SIZE, (rect.bottom - 1) // TILE_SIZE + 1):
+                for block in self.cells.get((column, row), ()):
+                    if block not in collisions and rect.colliderect(block.rect):
+                        if collided == None or collided(sprite, block):
+                            collisions.append(block)
+        collisions.sort(key=self.order.get)
+        return collisions
+
+class Tile_Layer():
+    """Static tiles baked onto cached chunk surfaces, so they are not blitted one by one every frame"""
+    def __init__(self, background):
+        """Initiates the tile layer"""
+        self.background = background
+        self.chunks = {} # Baked chunks (column, row: surface)
+        self.chunk_width = CHUNK_WIDTH * TILE_SIZE
+        self.chunk_height = CHUNK_HEIGHT * TILE_SIZE
+
+    def add(self, sprites):
+        """Bakes sprites onto the chunks they overlap"""
+        for sprite in sprites:
+            # Tile images can be slightly bigger than a tile, so they may overlap several chunks
+            for column in range(sprite.rect.left // self.chunk_width, (sprite.rect.right - 1) // self.chunk_width + 1):
+                for row in range(sprite.rect.top // self.chunk_height, (sprite.rect.bottom - 1) // self.chunk_height + 1):
+                    chunk = self.chunk(column, row)
+                    chunk.blit(sprite.image, sprite.rect.move(-column * self.chunk_width, -row * self.chunk_height))
+
+    def bake(self, column, row, sprites):
+        """Bakes sprites onto one chunk, any part of them outside the chunk is cut off"""
+        area = pygame.Rect(column * self.chunk_width, row * self.chunk_height, self.chunk_width, self.chunk_height)
+        for sprite in sprites:
+            if area.colliderect(sprite.rect):
+                self.chunk(column, row).blit(sprite.image, sprite.rect.move(-area.x, -area.y))
+
+    def evict(self, column, row):
+        """Frees a baked chunk"""
+        self.chunks.pop((column, row), None)
+
+    def chunk(self, column, row):
+        """Returns a chunk surface, creating it the first time a tile is baked onto it"""
+        if (column, row) not in self.chunks:
+            chunk = pygame.Surface((self.chunk_width, self.chunk_height))
+            # Chunks are opaque, so they match the display windows pixel format
+            if pygame.display.get_surface() != None:
+                chunk = chunk.convert()
+            chunk.fill(self.background)
+            self.chunks[(column, row)] = chunk
+        return self.chunks[(column, row)]
+
+    def draw(self, screen, camera, alpha=1):
+        """Draws the chunks that are inside the display window"""
+        x, y = camera.offset(alpha)
+        for column in range(-x // self.chunk_width, (-x + WIDTH - 1) // self.chunk_width + 1):
+            for row in range(-y // self.chunk_height, (-y + HEIGHT - 1) // self.chunk_height + 1):
+                chunk = self.chunks.get((column, row))
+                if chunk != None:
+                    screen.blit(chunk, (column * self.chunk_width + x, row * self.chunk_height + y))
 
 class Camera():
     """Camera object"""
@@ -40,15 +158,33 @@ class Camera():
         """Initializes camera"""
         # Cameras size
         self.camera = pygame.Rect(0, 0, width, height)
+        self.previous = self.camera.topleft # Position before the last update
         self.width = width
         self.height = height
 
-    def move_sprite(self, sprite):
-        """Moves sprite objects relative to the cameras position"""
-        return sprite.rect.move(self.camera.topleft)
+    def move_sprite(self, sprite, alpha=1):
+        """Moves sprite objects relative to the cameras position
+        Alpha blends between the last two updates (0 is the previous update, 1 is the latest)"""
+        if alpha == 1:
+            return sprite.rect.move(self.camera.topleft)
+        x, y = self.offset(alpha)
+        # Only moving sprites remember their previous position
+        if hasattr(sprite, "previous"):
+            x += (sprite.previous[0] - sprite.rect.x) * (1 - alpha)
+            y += (sprite.previous[1] - sprite.rect.y) * (1 - alpha)
+        return sprite.rect.move(round(x), round(y))
+
+    def offset(self, alpha=1):
+        """Returns the cameras position, blended between the last two updates"""
+        if alpha == 1:
+            return self.camera.topleft
+        x = self.previous[0] + (self.camera.x - self.previous[0]) * alpha
+        y = self.previous[1] + (self.camera.y - self.previous[1]) * alpha
+        return round(x), round(y)
 
     def update(self, sprite):
         """Moves the camera, which will follow a chosen sprite"""
+        self.previous = self.camera.topleft
         x = -sprite.rect.x + int(WIDTH / 2)
         y = -sprite.rect.y + int(HEIGHT / 2)
         
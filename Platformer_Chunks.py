@@ -0,0 +1,169 @@
+# Platformer level chunks
+
+# Imports required modules
+import pygame
+# Imports other game files
+from Platformer_Settings import *
+from Platformer_Sprites import *
+from Platformer_Camera import *
+
+# Tiles that are created once when the level is built, every other tile is streamed in with its chunk
+OBJECT_TILES = ["P", "D", "O", "F", "S", "K", "j"]
+# Sprites that are drawn one by one, in the order they are drawn in (terrain and spikes are on the tile layer)
+DRAW_LAYERS = [("doors", Door), ("jump pads", Jump_Pad), ("keys", Key), ("coins", Coin), ("spawners", Spawner), ("arrows", Arrow), ("orcs", Orc), ("flies", Fly), ("hero", Hero)]
+
+class Level_Chunks():
+    """Loads terrain, spikes and coins in chunks around the camera, and frees the chunks that are far away
+    Sprites in chunks away from the camera sleep (are not updated) and sprites outside the display window are not drawn"""
+    def __init__(self, game):
+        """Initiates the level chunks"""
+        self.game = game
+        self.map = game.map
+        self.chunk_width = CHUNK_WIDTH * TILE_SIZE
+        self.chunk_height = CHUNK_HEIGHT * TILE_SIZE
+        # Number of chunks the map is split into (in chunks)
+        self.bounds = pygame.Rect(0, 0, -(-self.map.tile_width // CHUNK_WIDTH), -(-self.map.tile_height // CHUNK_HEIGHT))
+        self.loaded = {} # Sprites of the loaded chunks (column, row: environment blocks, spikes, coins)
+        self.baked = set() # Chunks that are baked onto the tile layer
+        self.collected = set() # Map cells of the coins that were picked up, so they are not loaded again
+        self.area = pygame.Rect(0, 0, 0, 0) # Loaded chunks
+        self.active_area = None # Chunks where sprites are updated
+        self.objects = {} # Objects that never move, in the chunk they are in (column, row: sprites)
+        for group in (game.doors, game.jump_pads, game.keys, game.spawners):
+            for sprite in group:
+                self.objects.setdefault(self.chunk(sprite), []).append(sprite)
+        self.sleeping = {} # Enemies that stopped updating, in the chunk they stopped in (column, row: enemies)
+        self.layers = dict((layer, index) for index, (name, layer) in enumerate(DRAW_LAYERS)) # Draw layer of each sprite class
+
+    def update(self, camera):
+        """Loads the chunks around the camera and frees the rest, then puts far away sprites to sleep"""
+        view = self.view(camera)
+        area = view.inflate(CHUNK_MARGIN * 2, CHUNK_MARGIN * 2).clip(self.bounds)
+        # Everything that moves stays one chunk away from the unloaded chunks, so it never falls through missing terrain
+        active_area = view.inflate(CHUNK_MARGIN * 2 - 2, CHUNK_MARGIN * 2 - 2).clip(self.bounds)
+        if active_area != self.active_area:
+            self.rest(active_area)
+            self.active_area = active_area
+        if area != self.area:
+            for chunk in list(self.loaded):
+                if not area.collidepoint(chunk):
+                    self.unload(*chunk)
+            for column in range(area.left, area.right):
+                for row in range(area.top, area.bottom):
+                    if (column, row) not in self.loaded:
+                        self.load(column, row)
+            self.area = area
+        # Only the chunks that can be drawn are baked
+        for chunk in list(self.baked):
+            if not self.active_area.collidepoint(chunk):
+                self.game.tile_layer.evict(*chunk)
+                self.baked.remove(chunk)
+        for column in range(self.active_area.left, self.active_area.right):
+            for row in range(self.active_area.top, self.active_area.bottom):
+                if (column, row) not in self.baked:
+                    self.bake(column, row)
+        self.freeze()
+
+    def rest(self, active_area):
+        """Wakes up the sprites in chunks that became active and puts the sprites in chunks that stopped being active to sleep"""
+        for chunk in set(self.objects) | set(self.loaded) | set(self.sleeping):
+            awake = active_area.collidepoint(chunk)
+            was_awake = self.active_area == None or self.active_area.collidepoint(chunk)
+            # Objects and coins do nothing while nobody can see them, so they stop updating
+            sprites = self.objects.get(chunk, []) + (self.loaded[chunk][2] if chunk in self.loaded else [])
+            if awake and not was_awake:
+                for sprite in sprites + self.sleeping.pop(chunk, []):
+                    # Picked up coins and keys stay gone
+                    if sprite.alive():
+                        self.game.all_sprites.add(sprite)
+            elif was_awake and not awake:
+                self.game.all_sprites.remove(sprites)
+
+    def view(self, camera):
+        """Returns the chunks inside the display window (in chunks)"""
+        x, y = -camera.camera.x, -camera.camera.y
+        column = x // self.chunk_width
+        row = y // self.chunk_height
+        return pygame.Rect(column, row, (x + WIDTH - 1) // self.chunk_width - column + 1, (y + HEIGHT - 1) // self.chunk_height - row + 1)
+
+    def load(self, column, row):
+        """Creates the sprites of a chunk"""
+        environment = []
+        spikes = []
+        coins = []
+        for y in range(row * CHUNK_HEIGHT, min((row + 1) * CHUNK_HEIGHT, self.map.tile_height)):
+            for x in range(column * CHUNK_WIDTH, min((column + 1) * CHUNK_WIDTH, self.map.tile_width)):
+                tile = self.map.tile(x, y)
+                if tile == "." or tile in OBJECT_TILES:
+                    continue
+                elif tile == "s":
+                    spikes.append(Spikes(x, y, self.game))
+                elif tile == "c":
+                    if (x, y) not in self.collected:
+                        coins.append(Coin(x, y, self.game))
+                else:
+                    environment.append(Environment(x, y, tile, self.game))
+        self.game.grid.add(environment)
+        self.loaded[(column, row)] = (environment, spikes, coins)
+        if not self.active_area.collidepoint(column, row):
+            self.game.all_sprites.remove(coins)
+
+    def unload(self, column, row):
+        """Frees the sprites of a chunk"""
+        environment, spikes, coins = self.loaded.pop((column, row))
+        self.game.grid.remove(environment)
+        for sprite in environment + spikes + coins:
+            sprite.kill()
+
+    def bake(self, column, row):
+        """Bakes the terrain and spikes that overlap a chunk onto the tile layer"""
+        environment = []
+        spikes = []
+        # Tile images are slightly bigger than a tile, so tiles from the chunks around it can overlap it
+        for x in range(column - 1, column + 2):
+            for y in range(row - 1, row + 2):
+                if (x, y) in self.loaded:
+                    environment += self.loaded[(x, y)][0]
+                    spikes += self.loaded[(x, y)][1]
+        # Same order as the level was built in, so overlapping tiles are drawn the same way
+        environment.sort(key=lambda sprite: (sprite.y, sprite.x))
+        spikes.sort(key=lambda sprite: (sprite.y, sprite.x))
+        self.game.tile_layer.bake(column, row, environment + spikes)
+        self.baked.add((column, row))
+
+    def chunk(self, sprite):
+        """Returns the chunk a sprite is in"""
+        column = min(max(sprite.rect.centerx // self.chunk_width, 0), self.bounds.width - 1)
+        row = min(max(sprite.rect.centery // self.chunk_height, 0), self.bounds.height - 1)
+        return column, row
+
+    def active(self, sprite):
+        """Checks if a sprite is in a chunk where things can move"""
+        return self.active_area.collidepoint(self.chunk(sprite))
+
+    def freeze(self):
+        """Puts enemies that moved far away to sleep and removes arrows that flew too far"""
+        # Only sprites that are awake are checked, so the cost does not grow with the level
+        for sprite in self.game.all_sprites.sprites():
+            if self.game.enemies.has(sprite):
+                if not self.active(sprite):
+                    self.game.all_sprites.remove(sprite)
+                    sprite.previous = sprite.rect.topleft # Does not move while asleep
+                    self.sleeping.setdefault(self.chunk(sprite), []).append(sprite)
+            elif self.game.arrows.has(sprite) and not self.active(sprite):
+                sprite.kill()
+
+    def visible(self, offset):
+        """Returns the awake sprites inside the display window, sorted into their draw layers (name, sprites)"""
+        # Sprites are drawn in between updates, so the window is made slightly bigger
+        view = pygame.Rect(-offset[0], -offset[1], WIDTH, HEIGHT).inflate(TILE_SIZE * 2, TILE_SIZE * 2)
+        layers = [(name, []) for name, layer in DRAW_LAYERS]
+        for sprite in self.game.all_sprites:
+            index = self.layers.get(type(sprite))
+            if index != None and view.colliderect(sprite.rect):
+                layers[index][1].append(sprite)
+        return layers
+
+    def collect(self, coin):
+        """Remembers that a coin was picked up"""
+        self.collected.add((coin.x, coin.y))
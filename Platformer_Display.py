@@ -2,11 +2,80 @@
 
 # Imports required modules
 import pygame
+from collections import OrderedDict
 # Imports setting file
 from Platformer_Settings import *
+from Platformer_Assets import *
 vector = pygame.math.Vector2
-# Find font name
-font_name = pygame.font.match_font("times")
+# Font name is found the first time text is drawn (searching the system fonts is slow)
+font_name = None
+
+class Text_Cache():
+    """Fonts and rendered text, text is only rendered again when it changes"""
+    def __init__(self, limit=TEXT_CACHE_SIZE):
+        """Initiates the text cache"""
+        self.fonts = {} # Loaded fonts (size: font)
+        self.surfaces = OrderedDict() # Rendered text, least recently used first (text, colour, size: surface)
+        self.limit = limit
+
+    def font(self, size):
+        """Returns the font for a text size"""
+        global font_name
+        if font_name == None:
+            font_name = pygame.font.match_font("times")
+        if size not in self.fonts:
+            self.fonts[size] = pygame.font.Font(font_name, size)
+        return self.fonts[size]
+
+    def render(self, text, colour, size):
+        """Returns the rendered text surface"""
+        key = (text, tuple(colour), size)
+        # Text has already been rendered
+        if key in self.surfaces:
+            self.surfaces.move_to_end(key)
+        # New text
+        else:
+            self.surfaces[key] = self.font(size).render(text, True, colour)
+            # Forgets the least recently used text
+            if len(self.surfaces) > self.limit:
+                self.surfaces.popitem(last=False)
+        return self.surfaces[key]
+
+class Dirty_Rects():
+    """Collects the parts of the display window that changed, so only those parts are updated"""
+    def __init__(self, enabled=DIRTY_RECTS):
+        """Initiates the dirty rect collector"""
+        self.enabled = enabled
+        self.rects = [] # Parts drawn this frame
+        self.previous = [] # Parts drawn last frame (updated again so anything that moved away is erased)
+        self.full = True
+        self.position = None
+
+    def add(self, rect):
+        """Marks part of the display window as changed"""
+        if self.enabled:
+            self.rects.append(pygame.Rect(rect))
+        return rect
+
+    def redraw(self):
+        """Marks the whole display window as changed"""
+        self.full = True
+
+    def scroll(self, position):
+        """Marks the whole display window as changed if the view has moved"""
+        if position != self.position:
+            self.position = position
+            self.full = True
+
+    def update(self):
+        """Updates the changed parts of the display window"""
+        if not self.enabled or self.full:
+            pygame.display.update()
+        elif self.rects or self.previous:
+            pygame.display.update(self.rects + self.previous)
+        self.previous = self.rects
+        self.rects = []
+        self.full = False
 
 class Display(pygame.sprite.Sprite):
     """Display objects parent class"""
@@ -40,7 +109,7 @@ class Coin_Count(Display):
         
     def load_images(self):
         """Loads in image for coin display"""
-        self.coin = pygame.image.load("gold_coin.png")
+        self.coin = assets.image("gold_coin.png")
 
 class Health(Display):
     """Players health display"""
@@ -70,7 +139,7 @@ class Health(Display):
     
     def load_images(self):
         """Loads in images for health display animation"""
-        self.heart = [pygame.image.load("heart_full.png"), pygame.image.load("heart_half.png"), pygame.image.load("heart_empty.png")]
+        self.heart = [assets.image("heart_full.png"), assets.image("heart_half.png"), assets.image("heart_empty.png")]
 
 class Key_Display(Display):
     """Levels key display"""
@@ -95,7 +164,7 @@ class Key_Display(Display):
     
     def load_images(self):
         """Loads in images for key animation"""
-        self.keys = [pygame.image.load("key_empty.png"), pygame.image.load("key_full.png")]
+        self.keys = [assets.image("key_empty.png"), assets.image("key_full.png")]
 
 class Button():
     """Button object (was modified from button made by Tech With Tim, Youtube)"""
@@ -111,12 +180,13 @@ class Button():
         self.text_size = text_size
     
     def draw(self, surface):
-        """Draws the button onto the display window"""
-        pygame.draw.rect(surface, BLACK, (self.x - 2, self.y - 2, self.width + 4, self.height + 4), 0)
+        """Draws the button onto the display window, returns the part of the window that was drawn on"""
+        outline = pygame.draw.rect(surface, BLACK, (self.x - 2, self.y - 2, self.width + 4, self.height + 4), 0)
         pygame.draw.rect(surface, self.colour, (self.x, self.y, self.width, self.height), 0)
 
         if self.text != "":
             self.game.write(self.text, BLACK, self.text_size, int(self.x + self.width / 2), int(self.y + self.height / 2))
+        return outline
 
     def mouse_over(self, position):
         """Checks if the mouse is over the button"""
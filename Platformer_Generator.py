@@ -0,0 +1,81 @@
+# Platformer level generator
+
+# Imports required modules
+import random
+import argparse
+# Imports settings file
+from Platformer_Settings import *
+
+def generate(width, height, seed=None, coins=0.05, spikes=0.05, spawners=0.01, flies=0.005, jump_pads=0.02, platforms=0.06, keys=None):
+    """Creates a random tile map (rows of tile strings, the same as the lists in Platformer_Map)
+    Densities are the chance of each empty cell (or cell on top of the ground for spikes, spawners and jump pads) getting that tile"""
+    # Camera can not scroll around maps smaller than the display window
+    if width < GRID_WIDTH or height < GRID_HEIGHT:
+        raise ValueError("maps must be at least %d tiles wide and %d tiles high" % (GRID_WIDTH, GRID_HEIGHT))
+    generator = random.Random(seed)
+    tiles = [["."] * width for row in range(height)]
+    ground = height - 3 # Row the hero starts on
+    # Solid ground along the bottom of the map
+    tiles[height - 2] = ["g"] * width
+    tiles[height - 1] = ["d"] * width
+    # Floating platforms, three rows apart so the hero fits between them
+    for row in range(ground - 2, 1, -3):
+        column = 0
+        while column < width - 2:
+            if generator.random() < platforms:
+                length = min(generator.randint(2, 6), width - column)
+                tiles[row][column:column + length] = ["gl"] + ["g"] * (length - 2) + ["gr"]
+                column += length + 1
+            else:
+                column += 1
+    # Cells that have solid ground directly underneath them
+    surfaces = [(column, row) for row in range(1, height - 2) for column in range(width)
+                if tiles[row][column] == "." and tiles[row + 1][column] in ("g", "gl", "gr")]
+    # Start and exit, with space left around the hero
+    tiles[ground][1] = "P"
+    tiles[ground][width - 1] = "D"
+    start = [(column, row) for column in range(4) for row in range(ground - 2, ground + 1)]
+    surfaces = [cell for cell in surfaces if cell not in start and tiles[cell[1]][cell[0]] == "."]
+    # Keys have to be collected to open the door
+    if keys == None:
+        keys = max(1, width // 50)
+    for column, row in generator.sample(surfaces, min(keys, len(surfaces))):
+        tiles[row][column] = "K"
+    # Objects that stand on the ground
+    for column, row in surfaces:
+        if tiles[row][column] == ".":
+            chance = generator.random()
+            if chance < spikes:
+                tiles[row][column] = "s"
+            elif chance < spikes + spawners:
+                tiles[row][column] = "S"
+            elif chance < spikes + spawners + jump_pads:
+                tiles[row][column] = "j"
+    # Objects that float
+    for row in range(height - 2):
+        for column in range(width):
+            if tiles[row][column] == "." and (column, row) not in start:
+                chance = generator.random()
+                if chance < coins:
+                    tiles[row][column] = "c"
+                elif chance < coins + flies:
+                    tiles[row][column] = "F"
+    return tiles
+
+def count(tiles):
+    """Returns how many of each tile a map has"""
+    counts = {}
+    for row in tiles:
+        for tile in row:
+            counts[tile] = counts.get(tile, 0) + 1
+    return counts
+
+# Prints a summary of a generated map when the file is run
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generates a random level")
+    parser.add_argument("width", type=int)
+    parser.add_argument("height", type=int)
+    parser.add_argument("--seed", type=int)
+    arguments = parser.parse_args()
+    tiles = generate(arguments.width, arguments.height, arguments.seed)
+    print(count(tiles))
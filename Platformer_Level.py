@@ -0,0 +1,135 @@
+# Platformer level files
+
+# Imports required modules
+import mmap
+import struct
+import argparse
+from array import array
+
+# Maps store every tile as a one byte code, a code is given to each tile name the first time it is used
+tile_names = ["."] # Tile name of each code (empty tiles are always 0)
+tile_codes = {".": 0} # Code of each tile name
+bundled_maps = {} # Maps read from the asset bundle, so they are not packed again (level number, 0 for the town: width, height, tile codes)
+
+# Compiled level header (name, version, width, height, number of tile names)
+LEVEL_HEADER = struct.Struct("<4sBHHB")
+
+def tile_code(name):
+    """Returns the code for a tile name"""
+    if name not in tile_codes:
+        if len(tile_names) > 255:
+            raise ValueError("maps can not use more than 256 different tiles")
+        tile_codes[name] = len(tile_names)
+        tile_names.append(name)
+    return tile_codes[name]
+
+def pack_tiles(tiles, name="map"):
+    """Turns a tile map (rows of tile names) into its width, height and tile codes (name is used in errors)"""
+    if not tiles or not tiles[0]:
+        raise ValueError(name + " has no tiles")
+    codes = array("B")
+    for line in tiles:
+        if len(line) != len(tiles[0]):
+            raise ValueError("every row of a map must be the same length")
+        codes.extend(tile_code(tile) for tile in line)
+    return len(tiles[0]), len(tiles), codes
+
+def read_text(filename):
+    """Reads a text level, every line is a row of tile names seperated by commas (lines starting with # are skipped)"""
+    tiles = []
+    with open(filename) as file:
+        for line in file:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                tiles.append([tile.strip() for tile in line.split(",")])
+    return tiles
+
+def write_text(filename, tiles):
+    """Saves a tile map as a text level"""
+    with open(filename, "w") as file:
+        for line in tiles:
+            file.write(",".join(line) + "\n")
+
+def pack_level(tiles):
+    """Turns a tile map into a compiled level: header, tile names, then one byte per tile row by row"""
+    if not tiles or not tiles[0]:
+        raise ValueError("levels must have at least one tile")
+    names = ["."] # Codes in the file only cover the tiles the level uses
+    codes = {".": 0}
+    packed = bytearray()
+    for line in tiles:
+        if len(line) != len(tiles[0]):
+            raise ValueError("every row of a map must be the same length")
+        for tile in line:
+            if tile not in codes:
+                codes[tile] = len(names)
+                names.append(tile)
+            packed.append(codes[tile])
+    if len(names) > 255:
+        raise ValueError("levels can not use more than 255 different tiles")
+    data = bytearray(LEVEL_HEADER.pack(b"ABJL", 1, len(tiles[0]), len(tiles), len(names)))
+    for name in names:
+        encoded = name.encode("ascii")
+        data += bytes([len(encoded)]) + encoded
+    return bytes(data + packed)
+
+def compile_level(tiles, filename):
+    """Saves a tile map as a compiled level file"""
+    with open(filename, "wb") as file:
+        file.write(pack_level(tiles))
+
+def unpack_level(data, name="level"):
+    """Reads a compiled level from a buffer (bytes or a memory map), returns its width, height and tile codes"""
+    if len(data) < LEVEL_HEADER.size:
+        raise ValueError(name + " is not a compiled level")
+    level, version, width, height, count = LEVEL_HEADER.unpack_from(data)
+    if level != b"ABJL" or version != 1:
+        raise ValueError(name + " is not a compiled level")
+    # Table that turns the levels tile codes into the games tile codes
+    table = bytearray(256)
+    offset = LEVEL_HEADER.size
+    for code in range(count):
+        if offset >= len(data) or offset + 1 + data[offset] > len(data):
+            raise ValueError(name + " is missing tile names")
+        length = data[offset]
+        table[code] = tile_code(bytes(data[offset + 1:offset + 1 + length]).decode("ascii"))
+        offset += 1 + length
+    if len(data) < offset + width * height:
+        raise ValueError(name + " is missing tiles")
+    # Every tile is translated at once, without making a Python object for each tile
+    codes = array("B", bytes(data[offset:offset + width * height]).translate(table))
+    return width, height, codes
+
+def read_compiled(filename):
+    """Memory maps a compiled level file, returns its width, height and tile codes"""
+    with open(filename, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return unpack_level(data, filename)
+
+def read_level(filename):
+    """Reads a text or compiled level file, returns its width, height and tile codes"""
+    with open(filename, "rb") as file:
+        compiled = file.read(4) == b"ABJL"
+    if compiled:
+        return read_compiled(filename)
+    return pack_tiles(read_text(filename), filename)
+
+# Converts level files when the file is run
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Converts levels between the built in levels, text levels and compiled levels")
+    commands = parser.add_subparsers(dest="command", required=True)
+    compile_command = commands.add_parser("compile", help="compiles a text level")
+    compile_command.add_argument("text")
+    compile_command.add_argument("output")
+    export_command = commands.add_parser("export", help="saves a built in level as a text level")
+    export_command.add_argument("level", type=int)
+    export_command.add_argument("output")
+    arguments = parser.parse_args()
+    if arguments.command == "compile":
+        tiles = read_text(arguments.text)
+        if not tiles:
+            raise ValueError(arguments.text + " has no tiles")
+        compile_level(tiles, arguments.output)
+    else:
+        from Platformer_Map import tile_map
+        write_text(arguments.output, tile_map[arguments.level - 1])
@@ -4,34 +4,106 @@
 import pygame
 import random
 import time
+import os
+import argparse
 # Imports other game files
 from Platformer_Settings import *
 from Platformer_Sprites import *
 from Platformer_Camera import *
 from Platformer_Display import *
+from Platformer_Assets import *
+from Platformer_Replay import *
+from Platformer_Profiler import *
+from Platformer_Chunks import *
+from Platformer_Bundle import *
 
 #background = pygame.image.load("green_background.png")
 
 class Game():
     """Game object"""
-    def __init__(self):
+    def __init__(self, headless=HEADLESS, seed=None):
         """Initialize game window and pygame"""
+        self.headless = headless
+        # Sounds are only turned off for headless games, so later games in the same program still have sound
+        assets.silent = self.headless
+        if self.headless:
+            # Dummy drivers, so no display or sound card is needed (unless other drivers were already picked)
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+            os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
         pygame.init() 
-        pygame.mixer.init()
+        if not self.headless:
+            pygame.mixer.init()
+            assets.reserve_channels()
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT)) # Game window
         pygame.display.set_caption("Bow Man: A Bit Jumpy") # Game windows caption
+        assets.load_atlas() # Packed images are loaded from a few pages
+        assets.convert_images() # Images now match the windows pixel format
+        load_bundle() # Images, sounds and maps come from the asset bundle if it has been built
         self.clock = pygame.time.Clock()
+        self.text = Text_Cache() # Fonts and rendered text
+        self.dirty = Dirty_Rects() # Parts of the window that need updating
+        self.profiler = Profiler() # Timings for each part of the game loop
         self.running = True
         self.level = 1
         self.hero_coins = 0
+        self.difficulty = "normal"
+        self.hero = None
+        self.ticks = 0 # Simulated time in milliseconds, advances by the same amount every update
+        self.alpha = 1 # How far drawing is between the last two updates
+        # Every random number comes from the game, so the same seed plays the same game
+        if seed == None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.pressed = Key_State(0) # Keys pressed during the current update
+        self.recorder = None
+        self.replay = None
 
-    def load_map(self):
-        """Loads in map (level)"""
-        self.map = Map(self.level)
+    def record(self):
+        """Starts recording the keys pressed every update (call before loading the first level)"""
+        self.random.seed(self.seed)
+        self.recorder = Recorder(self.seed, self.difficulty, self.level)
+
+    def play_replay(self, filename):
+        """Plays back a replay file instead of reading the keyboard (call before loading the first level)"""
+        self.replay = Replay(filename)
+        self.seed = self.replay.seed
+        self.random.seed(self.seed)
+        self.difficulty = self.replay.difficulty
+        self.level = self.replay.level
+
+    def read_keys(self):
+        """Reads the keys pressed for this update, from the keyboard or a replay"""
+        if self.replay != None:
+            bits = self.replay.next()
+            # Game ends after the last recorded update
+            if self.replay.finished():
+                self.playing = False
+                self.running = False
+        else:
+            bits = pack_keys(pygame.key.get_pressed())
+        if self.recorder != None:
+            self.recorder.record(bits)
+        self.pressed = Key_State(bits)
+
+    def load_map(self, tiles=None):
+        """Loads in map (level), or a tile map or level file instead of the current levels map"""
+        self.map = Map(self.level if tiles == None else tiles)
  
     def new(self):
         """Starts new game"""
-        self.load_map()
+        self.load_level()
+        self.run()
+
+    def load_level(self, level=None, tiles=None):
+        """Builds a level without running it (defaults to the current level)
+        Tiles replaces the levels map with a tile map or a level file name"""
+        if level != None:
+            self.level = level
+        self.load_map(tiles)
+        # Hero has nowhere to start without a P tile
+        if not any(self.map.find(["P"])):
+            raise ValueError("levels must have a P tile, where the hero starts")
         # Creates different sprite groups, used for collisions
         self.all_sprites = pygame.sprite.Group()
         self.spawners = pygame.sprite.Group()
@@ -46,71 +118,135 @@ class Game():
         self.spikes = pygame.sprite.Group()
         self.coins = pygame.sprite.Group()
         self.display_objects = pygame.sprite.Group()
-        # Cycles through map array
-        for row, tiles in enumerate(self.map.tile_map):
-            for column, tile in enumerate(tiles):
-                # Creates object based on the list items (string)
-                if tile != ".":
-                    if tile == "P":
-                        if self.level == 1:
-                            self.hero = Hero(column, row, self)
-                        else:
-                            self.hero.position.x = column * TILE_SIZE
-                            self.hero.position.y = row * TILE_SIZE
-                            self.hero.rect.x, self.hero.rect.y = self.hero.position.x, self.hero.position.y
-                            self.all_sprites.add(self.hero)
-                    elif tile == "D":
-                        self.door = Door(column, row, self)
-                    elif tile == "s":
-                        self.spike = Spikes(column, row, self)
-                    elif tile == "O":
-                        self.orc = Orc(column, row, self, None)
-                    elif tile == "F":
-                        self.fly = Fly(column, row, self)
-                    elif tile == "c":
-                        self.coin = Coin(column, row, self)
-                    elif tile == "S":
-                        self.spawner = Spawner(column, row, self)
-                    elif tile == "K":
-                        self.key = Key(column, row, self)
-                    elif tile == "j":
-                        self.jump_pad = Jump_Pad(column, row, self)
-                    else:
-                        self.environment_block = Environment(column, row, tile, self)
-                
+        # Arrows and orcs are reused, so shooting and spawning do not create new sprites
+        self.arrow_pool = Sprite_Pool(Arrow, self, 5) # Hero can only have 5 arrows in the air
+        self.orc_pool = Sprite_Pool(Orc, self)
+        # Cycles through the maps objects (terrain, spikes and coins are loaded in chunks near the camera)
+        for column, row, tile in self.map.find(OBJECT_TILES):
+            # Creates object based on the tile name
+            if tile == "P":
+                if self.level == 1 or self.hero == None:
+                    self.hero = Hero(column, row, self)
+                else:
+                    self.hero.position.x = column * TILE_SIZE
+                    self.hero.position.y = row * TILE_SIZE
+                    self.hero.rect.x, self.hero.rect.y = self.hero.position.x, self.hero.position.y
+                    self.all_sprites.add(self.hero)
+            elif tile == "D":
+                self.door = Door(column, row, self)
+            elif tile == "O":
+                self.orc = self.orc_pool.get(column, row, None)
+            elif tile == "F":
+                self.fly = Fly(column, row, self)
+            elif tile == "S":
+                self.spawner = Spawner(column, row, self)
+            elif tile == "K":
+                self.key = Key(column, row, self)
+            elif tile == "j":
+                self.jump_pad = Jump_Pad(column, row, self)
+
+        self.orc_pool.allocate(2 * len(self.spawners)) # Each spawner can have 2 orcs alive
         self.camera = Camera(self.map.width, self.map.height)
+        # Environment blocks are indexed by map cell for collisions
+        self.grid = Tile_Grid(self.map)
+        # Terrain and spikes never change, so they are baked onto one layer
+        self.tile_layer = Tile_Layer(SKY_BLUE)
+        # Fills the grid and tile layer with the chunks near the camera
+        self.level_chunks = Level_Chunks(self)
         # Hero attribute display objects
         self.health_display = Health(0, 0, self)
         self.key_display = Key_Display(1, 0, self)
         self.coin_display = Coin_Count(2, 0, self)
         self.enemy_timer = 0
-        self.run()
+        # Nothing to blend with until the first update
+        self.camera.update(self.hero)
+        self.level_chunks.update(self.camera)
+        self.camera.previous = self.camera.camera.topleft
+        self.hero.previous = self.hero.rect.topleft
+        self.dirty.redraw()
+        self.playing = True
 
     def run(self):
         """Main game loop"""
         if self.running:
             self.playing = True
-            while self.playing:
-                self.clock.tick(FPS)
-                self.events()
-                self.update()
-                self.paint()
+            # Headless games are not drawn and update as fast as possible
+            if self.headless:
+                while self.playing:
+                    self.step()
+            else:
+                self.clock.tick() # Time spent loading the level is not caught up on
+                lag = 0 # Time that has passed but has not been updated yet
+                while self.playing:
+                    lag += min(self.clock.tick(FPS), MAX_FRAME_TIME)
+                    # Runs as many fixed updates as the time that passed, however long drawing took
+                    while lag >= STEP and self.playing:
+                        self.step()
+                        lag -= STEP
+                    # Draws the sprites in between the last two updates
+                    self.alpha = lag / STEP
+                    self.paint()
+
+    def step(self, frames=1):
+        """Runs fixed updates of the game loop, stops early if the level ends"""
+        for frame in range(frames):
+            if not self.playing:
+                break
+            self.profiler.start("events")
+            self.events()
+            self.profiler.stop("events")
+            self.profiler.start("update")
+            self.update()
+            self.profiler.stop("update")
 
     def update(self):
         """Updates Window"""
-        current = pygame.time.get_ticks()
+        self.ticks += STEP
+        self.read_keys()
+        # Positions before the update, used to draw moving sprites in between updates
+        self.hero.previous = self.hero.rect.topleft
+        for group in (self.orcs, self.flies, self.arrows):
+            for sprite in group:
+                sprite.previous = sprite.rect.topleft
+        current = self.ticks
         # Spawns an Orc enemy 
-        if current - self.enemy_timer > ENEMY_SPAWN + random.choice([-1000, 0, 1000, 3000]):
+        if current - self.enemy_timer > ENEMY_SPAWN + self.random.choice([-1000, 0, 1000, 3000]):
             self.enemy_timer = current 
             for spawner in self.spawners:
+                # Spawners far away from the hero are asleep
+                if not self.level_chunks.active(spawner):
+                    continue
                 self.enemy = spawner.create_enemy()
                 if self.enemy != None:
                     spawner.orcs.append(self.enemy)
         # Updates all the sprite objects and display objects
-        self.all_sprites.update()
+        self.profiler.start("update sprites")
+        self.profiler.update_sprites(self.all_sprites)
+        self.profiler.stop("update sprites")
+        self.profiler.start("pickups")
+        self.pickups()
+        self.profiler.stop("pickups")
         self.display_objects.update()
         # Camera follows the player sprite
+        self.profiler.start("camera")
         self.camera.update(self.hero)
+        self.profiler.stop("camera")
+        self.profiler.start("chunks")
+        self.level_chunks.update(self.camera)
+        self.profiler.stop("chunks")
+
+    def pickups(self):
+        """Checks if the hero touched any coins, keys or spikes (each group is only checked once per frame)"""
+        # Coins and keys are removed from every group once they are picked up
+        for coin in collide_masks(self.hero, self.coins, True):
+            coin.pick_up()
+            self.level_chunks.collect(coin)
+        for key in collide_masks(self.hero, self.keys, True):
+            key.grab_key()
+        # Spikes only deal damage once, no matter how many the hero landed on
+        spikes = collide_masks(self.hero, self.spikes)
+        if spikes:
+            spikes[0].spike_hit()
 
     def events(self):
         """Game loops events"""
@@ -126,6 +262,13 @@ class Game():
                         if self.playing:
                             self.playing = False
                         self.running = False
+                    # Shows the frame timings
+                    if event.key == pygame.K_F3:
+                        self.profiler.toggle()
+                        self.dirty.redraw()
+                    # Saves the frame timings
+                    if event.key == pygame.K_F4:
+                        self.profiler.export()
         # Checks if the player died
         if self.hero.dead == True:
             self.playing = False
@@ -133,49 +276,42 @@ class Game():
 
     def paint(self):  
         """Draws onto the window"""
+        self.profiler.start("paint")
         self.screen.fill(SKY_BLUE) # Makes the display windows background blue
+        self.dirty.scroll(self.camera.offset(self.alpha)) # Everything changes when the camera moves
 
         # Moves every sprite object based on the camera position, then displays it onto the window
         # Every group is drawn seperately such that certain sprites do not overlap with one another
-        for sprite in self.environment:
-            self.screen.blit(sprite.image, self.camera.move_sprite(sprite))
-        for sprite in self.doors:
-            self.screen.blit(sprite.image, self.camera.move_sprite(sprite))
-        for sprite in self.jump_pads:
-            self.screen.blit(sprite.image, self.camera.move_sprite(sprite))
-        for sprite in self.spikes:
-            self.screen.blit(sprite.image, self.camera.move_sprite(sprite))
-        for sprite in self.keys:
-            self.screen.blit(sprite.image, self.camera.move_sprite(sprite))
-        for sprite in self.coins:
-            self.screen.blit(sprite.image, self.camera.move_sprite(sprite))
-        for sprite in self.spawners:
-            self.screen.blit(sprite.image, self.camera.move_sprite(sprite))
-        for sprite in self.arrows:
-            self.screen.blit(sprite.image, self.camera.move_sprite(sprite))
-        for sprite in self.orcs:
-            self.screen.blit(sprite.image, self.camera.move_sprite(sprite))
-        for sprite in self.flies:
-            self.screen.blit(sprite.image, self.camera.move_sprite(sprite))
-        self.screen.blit(self.hero.image, self.camera.move_sprite(self.hero))
-
-
-
+        self.profiler.start("paint tiles")
+        self.tile_layer.draw(self.screen, self.camera, self.alpha)
+        self.profiler.stop("paint tiles")
+        # Only sprites inside the display window are drawn
+        self.profiler.start("cull")
+        layers = self.level_chunks.visible(self.camera.offset(self.alpha))
+        self.profiler.stop("cull")
+        for name, sprites in layers:
+            self.profiler.start("paint " + name)
+            for sprite in sprites:
+                self.dirty.add(self.screen.blit(sprite.image, self.camera.move_sprite(sprite, self.alpha)))
+            self.profiler.stop("paint " + name)
 
         # Displays the players attributes onto the screen
         for sprite in self.display_objects:
-            self.screen.blit(sprite.image, sprite)
+            self.dirty.add(self.screen.blit(sprite.image, sprite))
         # Players coin count
-        self.write(str(self.hero.coins), WHITE, 45, self.coin_display.position.x + self.coin_display.coin_space, self.coin_display.position.y + 32)
-        pygame.display.update()
+        self.dirty.add(self.write(str(self.hero.coins), WHITE, 45, self.coin_display.position.x + self.coin_display.coin_space, self.coin_display.position.y + 32))
+        self.profiler.stop("paint")
+        # Frame timings
+        if self.profiler.shown:
+            self.dirty.add(self.profiler.draw(self.screen))
+        self.dirty.update()
 
     def write(self, text, colour, size, x, y):
         """Draws text onto the screen"""
-        font = pygame.font.Font(font_name, size)
-        text_surface = font.render(text, True, colour)
+        text_surface = self.text.render(text, colour, size)
         text_rect = text_surface.get_rect()
         text_rect.center = x, y
-        self.screen.blit(text_surface, text_rect)
+        return self.screen.blit(text_surface, text_rect)
 
     def start_screen(self):
         """Games start screen"""
@@ -211,11 +347,16 @@ class Game():
                         if self.playing:
                             self.playing = False
                         self.running = False
-            self.wait() # Waits for user input
+            # Replays only go on after a death if the player carried on playing, so they never wait for a key
+            if self.replay == None:
+                self.wait() # Waits for user input
 
     def level_transition(self):
         """Level transition screen"""
         if self.running: # Game has not ended
+            start = time.perf_counter()
+            # Next levels and towns files are decoded while the transition screen is shown
+            prefetch = assets.prefetch(LEVEL_IMAGES + TOWN_IMAGES, LEVEL_TILES + TOWN_TILES, LEVEL_SOUNDS + TOWN_SOUNDS)
             self.screen.fill(LIGHT_GREEN[0])
             self.write("Level " + str(self.level), WHITE, 60, WIDTH / 2, HEIGHT / 2)
             pygame.display.update()
@@ -230,7 +371,10 @@ class Game():
                         if self.playing:
                             self.playing = False
                         self.running = False
-            time.sleep(1.5) # Stops the program for 1.5 seconds
+            assets.finish_prefetch(prefetch)
+            # Screen stays up for 1.5 seconds, however long loading took (headless games do not wait)
+            if not self.headless:
+                time.sleep(max(0, 1.5 - (time.perf_counter() - start)))
 
     def difficulty_screen(self):
         """Lets the player pick the game difficulty"""
@@ -240,12 +384,18 @@ class Game():
             self.god_mode = Button(LIGHT_GREEN[1], WIDTH / 2, HEIGHT / 3, 200, 50, "God Mode", 25, self)
             self.normal_mode = Button(LIGHT_GREEN[1], WIDTH / 2, HEIGHT / 2, 200, 50, "Normal", 25, self)
             self.impossible_mode = Button(LIGHT_GREEN[1], WIDTH / 2, HEIGHT / 1.5, 200, 50, "Impossible", 25, self )
+            self.dirty.redraw()
             waiting = True
+            changed = True
             while waiting:
-                self.god_mode.draw(self.screen)
-                self.normal_mode.draw(self.screen)
-                self.impossible_mode.draw(self.screen)
-                pygame.display.update()
+                # Buttons are only drawn again when the mouse did something
+                if changed:
+                    self.dirty.add(self.god_mode.draw(self.screen))
+                    self.dirty.add(self.normal_mode.draw(self.screen))
+                    self.dirty.add(self.impossible_mode.draw(self.screen))
+                    self.dirty.update()
+                    changed = False
+                self.clock.tick(FPS)
                 for event in pygame.event.get():
                     position = pygame.mouse.get_pos()
 
@@ -270,6 +420,7 @@ class Game():
                             waiting = False
                     
                     if event.type == pygame.MOUSEMOTION:
+                        changed = True
                         if self.god_mode.mouse_over(position):
                             self.god_mode.colour = LIGHT_GREEN[2]
                         else:
@@ -289,10 +440,11 @@ class Game():
         if self.running and self.level > 3:
             self.screen.fill(LIGHT_GREEN[0]) # Makes the windows background green
             self.write("You beat the game!!", WHITE, 45, WIDTH / 2, HEIGHT / 5)
+            pygame.display.update()
             waiting = True
             # Will display until the game is quit
             while waiting:
-                pygame.display.update()
+                self.clock.tick(FPS)
                 for event in pygame.event.get():
                     position = pygame.mouse.get_pos()
 
@@ -344,12 +496,19 @@ class Town():
 
     def update(self):
         """Updates the town window"""
+        self.game.ticks += STEP
+        self.game.read_keys()
         self.all_sprites.update()
         # Camera follows the hero sprite
         self.camera.update(self.hero)
     
     def new(self):
         """Creates new town"""
+        self.load()
+        self.run()
+
+    def load(self):
+        """Builds the town without running it"""
         # Loads in the town map
         self.load_town()
         # Creates sprite groups
@@ -359,52 +518,77 @@ class Town():
         self.path_blocks = pygame.sprite.Group()
         self.town_doors = pygame.sprite.Group()
         self.decorations = pygame.sprite.Group()
-        # Cycles through tile map array
-        for row, tiles in enumerate(self.town_map.tile_town):
-            for column, tile in enumerate(tiles):
-                # Creates object based on the list items (string)
-                # Player
-                if tile == "P":
-                    self.town_path = Town_Path(column, row, "dtm", self)
-                    self.hero = Town_Hero(column, row, self)
-                # Door
-                elif tile == "D":
-                    self.town_path = Town_Path(column, row, "dtr", self)
-                    self.door = Town_Door(column, row, self)
-                # Shop
-                elif tile[0] == "r":
-                    if tile[1] != "d":
-                        self.town_block = Town_Terrain(column, row, "g", self)
-                    # Front of the roof
-                    if tile[1] == "f":
-                        self.building_tile = Town_Shop(column, row, "rt", self)
-                    # Door frame
-                    if tile[1] == "d":
-                        self.shop = Town_Shop(column, row, "rD", self)
-                    self.building_tile = Town_Shop(column, row, tile, self)
-                # Path
-                elif tile[0] == "d":
-                    self.town_path = Town_Path(column, row, tile, self)
-                # Decorations
-                elif tile[0] == "b":
+        # Cycles through the town maps tiles
+        for column, row, tile in self.town_map.tiles():
+            # Creates object based on the tile name
+            # Player
+            if tile == "P":
+                self.town_path = Town_Path(column, row, "dtm", self)
+                self.hero = Town_Hero(column, row, self)
+            # Door
+            elif tile == "D":
+                self.town_path = Town_Path(column, row, "dtr", self)
+                self.door = Town_Door(column, row, self)
+            # Shop
+            elif tile[0] == "r":
+                if tile[1] != "d":
                     self.town_block = Town_Terrain(column, row, "g", self)
-                    self.decoration = Decorations(column, row, tile, self)
-                # Terrain
-                else:
-                    self.town_block = Town_Terrain(column, row, tile, self)
+                # Front of the roof
+                if tile[1] == "f":
+                    self.building_tile = Town_Shop(column, row, "rt", self)
+                # Door frame
+                if tile[1] == "d":
+                    self.shop = Town_Shop(column, row, "rD", self)
+                self.building_tile = Town_Shop(column, row, tile, self)
+            # Path
+            elif tile[0] == "d":
+                self.town_path = Town_Path(column, row, tile, self)
+            # Decorations
+            elif tile[0] == "b":
+                self.town_block = Town_Terrain(column, row, "g", self)
+                self.decoration = Decorations(column, row, tile, self)
+            # Terrain
+            else:
+                self.town_block = Town_Terrain(column, row, tile, self)
         # Creates camera
         self.camera = Camera(self.town_map.width, self.town_map.height)
-        self.run()
+        # The shop door opens and closes, so it is drawn every frame along with its door frame
+        self.shop_tiles = [tile for tile in self.building_tiles if tile.type[1] in ("d", "D")]
+        # Every other tile never changes, so they are baked onto one layer
+        self.tile_layer = Tile_Layer(BLACK)
+        self.tile_layer.add(self.town_blocks)
+        self.tile_layer.add(self.path_blocks)
+        self.tile_layer.add([tile for tile in self.building_tiles if tile not in self.shop_tiles])
+        self.tile_layer.add(self.decorations)
+        self.game.dirty.redraw()
+        self.playing = True
     
     def run(self):
         """Runs the town game loop"""
         # Town loop will continue to run until self.playing is set to false
         self.playing = True
-        while self.playing:
-            self.clock.tick(FPS)
+        # Headless towns are not drawn and update as fast as possible
+        if self.game.headless:
+            while self.playing and self.game.running:
+                self.step()
+        else:
+            self.clock.tick() # Time spent loading the town is not caught up on
+            lag = 0 # Time that has passed but has not been updated yet
+            while self.playing and self.game.running:
+                lag += min(self.clock.tick(FPS), MAX_FRAME_TIME)
+                # Runs as many fixed updates as the time that passed
+                while lag >= STEP and self.playing and self.game.running:
+                    self.step()
+                    lag -= STEP
+                self.paint()
+
+    def step(self, frames=1):
+        """Runs fixed updates of the town loop, stops early if the hero leaves the town"""
+        for frame in range(frames):
+            if not self.playing or not self.game.running:
+                break
             self.events()
             self.update()
-            self.paint()
 
     def events(self):
         """Town loop events"""
@@ -423,28 +607,49 @@ class Town():
 
     def paint(self):
         """Draws the sprites onto the display window"""
-        # Cycles through all the sprite groups and blits them onto the screen
-        for sprite in self.town_blocks:
-            self.game.screen.blit(sprite.image, self.camera.move_sprite(sprite))
-        for sprite in self.path_blocks:
-            self.game.screen.blit(sprite.image, self.camera.move_sprite(sprite))
-        for sprite in self.building_tiles:
-            self.game.screen.blit(sprite.image, self.camera.move_sprite(sprite))
+        self.game.dirty.scroll(self.camera.camera.topleft) # Everything changes when the camera moves
+        # Draws the baked tiles, then cycles through the remaining sprite groups and blits them onto the screen
+        self.tile_layer.draw(self.game.screen, self.camera)
+        for sprite in self.shop_tiles:
+            self.game.dirty.add(self.game.screen.blit(sprite.image, self.camera.move_sprite(sprite)))
         for sprite in self.town_doors:
-            self.game.screen.blit(sprite.image, self.camera.move_sprite(sprite))
-        for sprite in self.decorations:
-            self.game.screen.blit(sprite.image, self.camera.move_sprite(sprite))
-        self.game.screen.blit(self.hero.image, self.camera.move_sprite(self.hero))
-        pygame.display.update()
+            self.game.dirty.add(self.game.screen.blit(sprite.image, self.camera.move_sprite(sprite)))
+        self.game.dirty.add(self.game.screen.blit(self.hero.image, self.camera.move_sprite(self.hero)))
+        self.game.dirty.update()
     
-game = Game() # Creates game object
-game.start_screen()
-game.difficulty_screen()
-# Continues creating new games until the game.running variable is set to False
-while game.running:
-    game.level_transition()
-    game.new()
-    game.town_level()
-    game.end_screen()
-    game.victory_screen()
-pygame.quit()
\ No newline at end of file
+def main(record=None, replay=None):
+    """Plays the game, optionally recording it to or playing it back from a replay file"""
+    game = Game() # Creates game object
+    # Replays already know the difficulty
+    if replay != None:
+        game.play_replay(replay)
+    # Nobody can press keys in a headless game, so it can only play back a replay
+    elif game.headless:
+        raise SystemExit("headless games (HEADLESS in Platformer_Settings) need a replay to play, use --replay")
+    else:
+        game.start_screen()
+        game.difficulty_screen()
+        if record != None:
+            game.record()
+    # Continues creating new games until the game.running variable is set to False
+    while game.running:
+        game.level_transition()
+        game.new()
+        game.town_level()
+        # Headless games skip the screens that wait for a key
+        if not game.headless:
+            game.end_screen()
+            game.victory_screen()
+        elif game.level > 3:
+            game.running = False
+    if record != None:
+        game.recorder.save(record)
+    pygame.quit()
+
+# Only plays the game when the file is run (importing it just loads the game classes)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bow Man: A Bit Jumpy")
+    parser.add_argument("--record", help="saves the keys pressed to a replay file")
+    parser.add_argument("--replay", help="plays back a replay file")
+    arguments = parser.parse_args()
+    main(arguments.record, arguments.replay)
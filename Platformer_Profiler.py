@@ -0,0 +1,103 @@
+# Platformer Profiler
+
+# Imports required modules
+import pygame
+import time
+import csv
+import json
+from collections import deque
+# Imports settings file
+from Platformer_Settings import *
+from Platformer_Display import *
+
+class Profiler():
+    """Rolling timings (in milliseconds) for each part of the game loop"""
+    def __init__(self, enabled=PROFILE, frames=PROFILE_FRAMES):
+        """Initiates the profiler"""
+        self.enabled = enabled
+        self.shown = False # Timings are drawn over the game
+        self.frames = frames # Number of timings kept for each part
+        self.timings = {} # Latest timings (name: timings)
+        self.started = {} # Start time of the parts being timed (name: time)
+        # Timings change every frame, so they have their own text cache instead of pushing the games text out of its cache
+        self.text = Text_Cache(HEIGHT // 16)
+
+    def start(self, name):
+        """Starts timing part of the game loop"""
+        if self.enabled:
+            self.started[name] = time.perf_counter()
+
+    def stop(self, name):
+        """Stops timing part of the game loop"""
+        # Parts started before the profiler was turned on have no start time
+        if self.enabled and name in self.started:
+            self.add(name, (time.perf_counter() - self.started.pop(name)) * 1000)
+
+    def add(self, name, milliseconds):
+        """Adds a timing"""
+        if name not in self.timings:
+            self.timings[name] = deque(maxlen=self.frames)
+        self.timings[name].append(milliseconds)
+
+    def update_sprites(self, group):
+        """Updates a sprite group, timing the sprites of each class seperately"""
+        if not self.enabled:
+            group.update()
+            return
+        totals = {}
+        # The sprites are copied, as they can remove themselves from the group while updating
+        for sprite in group.sprites():
+            start = time.perf_counter()
+            sprite.update()
+            name = "update " + type(sprite).__name__
+            totals[name] = totals.get(name, 0) + time.perf_counter() - start
+        for name in totals:
+            self.add(name, totals[name] * 1000)
+
+    def toggle(self):
+        """Shows or hides the timings, timing starts the first time they are shown"""
+        self.shown = not self.shown
+        if self.shown:
+            self.enabled = True
+
+    def export(self, name="profile"):
+        """Saves the timings to both a CSV and a JSON file"""
+        self.export_csv(name + ".csv")
+        self.export_json(name + ".json")
+
+    def report(self):
+        """Returns the average and slowest timing for every part (slowest average first)"""
+        rows = []
+        for name in self.timings:
+            timings = self.timings[name]
+            rows.append({"name": name, "average": sum(timings) / len(timings), "max": max(timings), "samples": len(timings)})
+        rows.sort(key=lambda row: row["average"], reverse=True)
+        return rows
+
+    def draw(self, screen):
+        """Draws the timings onto the screen, returns the part of the screen that was drawn on"""
+        rows = self.report()[:(HEIGHT - 24) // 16] # Slowest parts that fit on the screen
+        area = pygame.Rect(WIDTH - 300, 0, 300, 16 * len(rows) + 24)
+        overlay = pygame.Surface(area.size, pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 160))
+        screen.blit(overlay, area)
+        # Frame budget at the current update rate
+        screen.blit(self.text.render("Budget: %.1f ms" % STEP, WHITE, 16), (area.x + 8, area.y + 4))
+        for index, row in enumerate(rows):
+            line = "%-24s %6.2f %6.2f" % (row["name"], row["average"], row["max"])
+            screen.blit(self.text.render(line, WHITE, 16), (area.x + 8, area.y + 20 + index * 16))
+        return area
+
+    def export_csv(self, filename):
+        """Saves every timing to a CSV file"""
+        with open(filename, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["name", "sample", "milliseconds"])
+            for name in self.timings:
+                for sample, milliseconds in enumerate(self.timings[name]):
+                    writer.writerow([name, sample, milliseconds])
+
+    def export_json(self, filename):
+        """Saves the timing report and every timing to a JSON file"""
+        with open(filename, "w") as file:
+            json.dump({"report": self.report(), "timings": {name: list(self.timings[name]) for name in self.timings}}, file, indent=2)
@@ -0,0 +1,119 @@
+# Platformer input recording and replays
+
+# Imports required modules
+import pygame
+import struct
+
+# Keys the game reads, every key is stored as one bit
+RECORDED_KEYS = [pygame.K_LEFT, pygame.K_a, pygame.K_RIGHT, pygame.K_d, pygame.K_UP, pygame.K_w, pygame.K_DOWN, pygame.K_s, pygame.K_LSHIFT, pygame.K_RSHIFT]
+DIFFICULTIES = ["god", "normal", "impossible"]
+SHOP_ITEMS = ["armour", "medicine"] # Shop buttons, every click is stored as one byte
+# Replay file header (name, version, seed, difficulty, level, updates, runs)
+REPLAY_HEADER = struct.Struct("<4sBIBBII")
+REPLAY_RUN = struct.Struct("<HH") # Pressed keys and how many updates in a row they were pressed for
+REPLAY_SHOPS = struct.Struct("<H") # Number of shop visits, each visit is its number of clicks followed by the items clicked
+
+def pack_keys(pressed):
+    """Turns the pressed keys (from pygame.key.get_pressed) into bits"""
+    bits = 0
+    for index, key in enumerate(RECORDED_KEYS):
+        if pressed[key]:
+            bits |= 1 << index
+    return bits
+
+class Key_State():
+    """Keys pressed during one update, read the same way as pygame.key.get_pressed"""
+    def __init__(self, bits):
+        """Initiates the key state"""
+        self.bits = bits
+
+    def __getitem__(self, key):
+        """Checks if a key is pressed"""
+        if key in RECORDED_KEYS:
+            return bool(self.bits >> RECORDED_KEYS.index(key) & 1)
+        return False
+
+class Recorder():
+    """Records the keys pressed during every update"""
+    def __init__(self, seed, difficulty, level):
+        """Initiates the recorder"""
+        self.seed = seed
+        self.difficulty = difficulty
+        self.level = level
+        self.updates = 0
+        self.runs = [] # Runs of the same keys ([bits, updates])
+        self.shops = [] # Items clicked during each shop visit
+
+    def record(self, bits):
+        """Records the keys pressed for one update"""
+        self.updates += 1
+        # Same keys as the last update
+        if self.runs and self.runs[-1][0] == bits and self.runs[-1][1] < 65535:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([bits, 1])
+
+    def visit_shop(self):
+        """Records the start of a shop visit"""
+        self.shops.append([])
+
+    def buy(self, item):
+        """Records a click on a shop item"""
+        self.shops[-1].append(item)
+
+    def save(self, filename):
+        """Saves the recording to a replay file"""
+        with open(filename, "wb") as file:
+            file.write(REPLAY_HEADER.pack(b"ABJR", 2, self.seed, DIFFICULTIES.index(self.difficulty), self.level, self.updates, len(self.runs)))
+            for bits, updates in self.runs:
+                file.write(REPLAY_RUN.pack(bits, updates))
+            file.write(REPLAY_SHOPS.pack(len(self.shops)))
+            for items in self.shops:
+                file.write(REPLAY_SHOPS.pack(len(items)) + bytes(SHOP_ITEMS.index(item) for item in items))
+
+class Replay():
+    """Plays back the keys from a replay file"""
+    def __init__(self, filename):
+        """Loads in the replay file"""
+        with open(filename, "rb") as file:
+            data = file.read()
+        name, version, self.seed, difficulty, self.level, self.updates, runs = REPLAY_HEADER.unpack_from(data)
+        if name != b"ABJR" or version not in (1, 2):
+            raise ValueError(filename + " is not a replay file")
+        self.difficulty = DIFFICULTIES[difficulty]
+        self.runs = [REPLAY_RUN.unpack_from(data, REPLAY_HEADER.size + index * REPLAY_RUN.size) for index in range(runs)]
+        self.shops = [] # Items clicked during each shop visit (version 1 replays have no shop visits)
+        if version >= 2:
+            offset = REPLAY_HEADER.size + runs * REPLAY_RUN.size
+            visits, = REPLAY_SHOPS.unpack_from(data, offset)
+            offset += REPLAY_SHOPS.size
+            for visit in range(visits):
+                clicks, = REPLAY_SHOPS.unpack_from(data, offset)
+                offset += REPLAY_SHOPS.size
+                self.shops.append([SHOP_ITEMS[code] for code in data[offset:offset + clicks]])
+                offset += clicks
+        self.visits = 0 # Shop visits played back
+        self.run = 0 # Current run
+        self.used = 0 # Updates used from the current run
+
+    def next(self):
+        """Returns the keys pressed for the next update (no keys once the replay has finished)"""
+        if self.finished():
+            return 0
+        bits, updates = self.runs[self.run]
+        self.used += 1
+        if self.used == updates:
+            self.run += 1
+            self.used = 0
+        return bits
+
+    def visit_shop(self):
+        """Returns the items clicked during the next shop visit"""
+        if self.visits >= len(self.shops):
+            return []
+        self.visits += 1
+        return self.shops[self.visits - 1]
+
+    def finished(self):
+        """Checks if every update has been played back"""
+        return self.run >= len(self.runs)
@@ -8,6 +8,11 @@ TILE_SIZE = 64
 GRID_WIDTH = WIDTH / TILE_SIZE
 GRID_HEIGHT = HEIGHT / TILE_SIZE
 
+# Static tiles are baked onto cached surfaces in chunks of tiles
+CHUNK_WIDTH = 16
+CHUNK_HEIGHT = 8
+CHUNK_MARGIN = 2 # Chunks of the level that stay loaded around the display window
+
 ENEMY_SPAWN = 10000
 
 # Colours and FPS
@@ -19,7 +24,39 @@ BLUE = (0, 0, 255)
 LIGHT_GREEN = [(152, 255, 152), (152, 215, 152), (40, 170, 40)]
 SKY_BLUE = (135,206,235)
 GREY = [(211, 211, 211), (169, 169, 169)]
-FPS = 40
+FPS = 40 # Frames drawn per second (can be raised, drawing blends between updates)
+TICK_RATE = 40 # Updates per second (speeds, jumps and timers are per update, so changing this changes the game speed)
+STEP = 1000 / TICK_RATE # Simulated milliseconds per update
+MAX_FRAME_TIME = 250 # Longest time (milliseconds) the game will catch up on after a slow frame
+
+# Runs the game without a window or sound, as fast as possible (used to play back replays automatically)
+HEADLESS = False
+
+# Number of rendered text surfaces that are kept
+TEXT_CACHE_SIZE = 64
+
+# Only updates the parts of the display window that changed (helps software and remote displays)
+DIRTY_RECTS = False
+
+# Run length encodes the static tile images (faster blits, slower pixel access)
+RLE_TILES = False
+
+# Times every part of the game loop (F3 shows the timings, F4 saves them)
+PROFILE = False
+PROFILE_FRAMES = 120 # Number of timings kept for each part
+
+# Sound channels, the most copies of one sound that play at once and the channel kept for the heros sounds
+SOUND_CHANNELS = 16
+SOUND_LIMIT = 3
+HERO_CHANNEL = 0
+
+# Images are packed into atlas pages (see Platformer_Atlas), the index says where each image is
+ATLAS_INDEX = "atlas.json"
+ATLAS_SIZE = 1024 # Biggest width and height of a page
+ATLAS_PADDING = 1 # Empty pixels between images
+
+# Images, sounds and maps saved ready to use (see Platformer_Bundle), so starting the game decodes nothing
+BUNDLE_FILE = "assets.abjb"
 
 # Hero attributes
 ACC = 0.2
@@ -2,12 +2,48 @@
 
 # Imports required modules
 import pygame
-import random
 # Imports settings file
 from Platformer_Settings import *
+from Platformer_Assets import *
 from Platformer_Display import *
 vector = pygame.math.Vector2
 
+def collide_masks(sprite, group, dokill=False):
+    """Works like pygame.sprite.spritecollide with collide_mask, but only compares the masks of sprites whose rects touch"""
+    collisions = [other for other in pygame.sprite.spritecollide(sprite, group, False) if pygame.sprite.collide_mask(sprite, other)]
+    if dokill:
+        for other in collisions:
+            other.kill()
+    return collisions
+
+class Sprite_Pool():
+    """Sprites that are reused instead of being created and freed, so combat does not allocate new sprites
+    Pooled sprites are created with only the game, reset puts them back into the level and kill returns them to the pool"""
+    def __init__(self, sprite_class, game, size=0):
+        """Initiates the pool"""
+        self.sprite_class = sprite_class
+        self.game = game
+        self.free = [] # Sprites that are not in the level
+        self.allocate(size)
+
+    def allocate(self, size):
+        """Creates sprites until the given number of them are free"""
+        while len(self.free) < size:
+            self.free.append(self.sprite_class(self.game))
+
+    def get(self, *arguments):
+        """Returns a free sprite reset with the arguments (a new sprite is only created if every one is in use)"""
+        if self.free:
+            sprite = self.free.pop()
+        else:
+            sprite = self.sprite_class(self.game)
+        sprite.reset(*arguments)
+        return sprite
+
+    def release(self, sprite):
+        """Returns a sprite that left the level to the pool"""
+        self.free.append(sprite)
+
 # Main game classes (for the platformer gameplay)
 
 class Hero(pygame.sprite.Sprite):
@@ -21,6 +57,7 @@ class Hero(pygame.sprite.Sprite):
         self.load_images()
         self.load_sounds()
         self.image = self.standing[0]
+        self.mask = assets.mask(self.image) # Creates an image mask for collisions
         self.position = vector(int(x * TILE_SIZE), int(y * TILE_SIZE))
         self.rect = self.image.get_rect()
         self.rect.x, self.rect.y = self.position
@@ -59,7 +96,7 @@ class Hero(pygame.sprite.Sprite):
         """Checks if the hero collides with the walls"""
         # Falling
         if self.velocity.y > 0: 
-            collisions = pygame.sprite.spritecollide(self, self.game.environment, False, pygame.sprite.collide_mask)
+            collisions = self.game.grid.collide(self, pygame.sprite.collide_mask)
             if collisions: # Checks if the player had a collision
                 # Finds the lowest (closest to the bottom of the window) environmental block the player collided with
                 lowest = collisions[0]
@@ -72,7 +109,7 @@ class Hero(pygame.sprite.Sprite):
 
         # Moving left or right and is not jumping or falling 
         if abs(self.velocity.x) > 0 and abs(self.velocity.y) == 0:
-            collisions = pygame.sprite.spritecollide(self, self.game.environment, False)
+            collisions = self.game.grid.collide(self)
             if collisions: # Checks if the player had a collision
                 # Finds the highest (furthest from the bottom of the window) environmental block the player collided with
                 highest = collisions[0]
@@ -97,7 +134,7 @@ class Hero(pygame.sprite.Sprite):
         if self.arrow_timer == 50:
             self.arrow_timer = 0
 
-        KEYS = pygame.key.get_pressed()
+        KEYS = self.game.pressed # Keys read by the game for this update
         # Moving left
         if KEYS[pygame.K_LEFT] or KEYS[pygame.K_a]: 
             self.acceleration.x = -ACC
@@ -115,9 +152,9 @@ class Hero(pygame.sprite.Sprite):
                 self.shooting = True
                 self.arrow_timer = 1
                 if self.right == True:
-                    arrow = Arrow("r", self.game)
+                    arrow = self.game.arrow_pool.get("r")
                 else:
-                    arrow = Arrow("l", self.game)
+                    arrow = self.game.arrow_pool.get("l")
 
     def move(self):
         """Moves the hero sprite"""
@@ -133,7 +170,7 @@ class Hero(pygame.sprite.Sprite):
 
     def do_jump(self):
         """Performs hero jump"""
-        collisions = pygame.sprite.spritecollide(self, self.game.environment, False)
+        collisions = self.game.grid.collide(self)
         if collisions: # Checks if the player can jump (is on a platform)
             # Finds the lowest (closest to the bottom of the screen) block the player collided with
             lowest = collisions[0]
@@ -142,25 +179,25 @@ class Hero(pygame.sprite.Sprite):
                     lowest = collision
             # Can only jump if the player is standing on the block (can not jump inside the block)
             if self.rect.bottom == lowest.rect.top + 10:
-                if self.game.jump_pad.can_jump(): # Is on a jump pad
+                if self.game.jump_pads and self.game.jump_pad.can_jump(): # Is on a jump pad (not every level has one)
                     self.velocity.y = -10.2
-                    pygame.mixer.Sound.play(self.jump[1])
+                    self.jump[1].play()
                 else:
                     self.velocity.y = -7
-                    pygame.mixer.Sound.play(self.jump[0])
+                    self.jump[0].play()
 
     def died(self):
         """Checks if the player died"""
         if self.hearts < 1:
             self.dead = True
-            pygame.mixer.Sound.play(self.dead_sound)
+            self.dead_sound.play()
         if self.position.x > self.game.map.width or self.position.y > self.game.map.height:
             self.dead = True
-            pygame.mixer.Sound.play(self.dead_sound)
+            self.dead_sound.play()
 
     def animation(self):
         """Animates the hero sprite"""
-        current = pygame.time.get_ticks()
+        current = self.game.ticks
         # Shooting animation
         if self.shooting == True:
             if current - self.previous_U > 50: # Determines the speed of the animation
@@ -194,35 +231,43 @@ class Hero(pygame.sprite.Sprite):
                     self.image = self.running_left[self.frame_count]
 
         # Creates an image mask for collisions
-        self.mask = pygame.mask.from_surface(self.image)
+        self.mask = assets.mask(self.image)
 
     def load_images(self):
         """Loads in images for hero sprite animation"""
-        self.running_right = [pygame.image.load("hero_walking_right_1.png"), pygame.image.load("hero_walking_right_2.png"), pygame.image.load("hero_walking_right_3.png"), pygame.image.load("hero_walking_right_4.png"), pygame.image.load("hero_walking_right_5.png"), pygame.image.load("hero_walking_right_6.png"), pygame.image.load("hero_walking_right_7.png"), pygame.image.load("hero_walking_right_8.png"), pygame.image.load("hero_walking_right_9.png")]
-        self.running_left = [pygame.image.load("hero_walking_left_1.png"), pygame.image.load("hero_walking_left_2.png"), pygame.image.load("hero_walking_left_3.png"), pygame.image.load("hero_walking_left_4.png"), pygame.image.load("hero_walking_left_5.png"), pygame.image.load("hero_walking_left_6.png"), pygame.image.load("hero_walking_left_7.png"), pygame.image.load("hero_walking_left_8.png"), pygame.image.load("hero_walking_left_9.png")]
-        self.standing = [pygame.image.load("hero_standing_1.png"), pygame.image.load("hero_standing_2.png"), pygame.image.load("hero_standing_3.png"), pygame.image.load("hero_standing_4.png"), pygame.image.load("hero_standing_5.png"), pygame.image.load("hero_standing_6.png"), pygame.image.load("hero_standing_7.png")]
-        self.bow_left = [pygame.image.load("hero_bow_left_1.png"), pygame.image.load("hero_bow_left_2.png"), pygame.image.load("hero_bow_left_3.png"), pygame.image.load("hero_bow_left_4.png"), pygame.image.load("hero_bow_left_5.png"), pygame.image.load("hero_bow_left_6.png"), pygame.image.load("hero_bow_left_7.png"), pygame.image.load("hero_bow_left_8.png"), pygame.image.load("hero_bow_left_9.png"), pygame.image.load("hero_bow_left_10.png"), pygame.image.load("hero_bow_left_11.png"), pygame.image.load("hero_bow_left_12.png"), pygame.image.load("hero_bow_left_13.png")]       
-        self.bow_right = [pygame.image.load("hero_bow_right_1.png"), pygame.image.load("hero_bow_right_2.png"), pygame.image.load("hero_bow_right_3.png"), pygame.image.load("hero_bow_right_4.png"), pygame.image.load("hero_bow_right_5.png"), pygame.image.load("hero_bow_right_6.png"), pygame.image.load("hero_bow_right_7.png"), pygame.image.load("hero_bow_right_8.png"), pygame.image.load("hero_bow_right_9.png"), pygame.image.load("hero_bow_right_10.png"), pygame.image.load("hero_bow_right_11.png"), pygame.image.load("hero_bow_right_12.png"), pygame.image.load("hero_bow_right_13.png")]
+        self.running_right = [assets.image("hero_walking_right_1.png"), assets.image("hero_walking_right_2.png"), assets.image("hero_walking_right_3.png"), assets.image("hero_walking_right_4.png"), assets.image("hero_walking_right_5.png"), assets.image("hero_walking_right_6.png"), assets.image("hero_walking_right_7.png"), assets.image("hero_walking_right_8.png"), assets.image("hero_walking_right_9.png")]
+        self.running_left = [assets.image("hero_walking_left_1.png"), assets.image("hero_walking_left_2.png"), assets.image("hero_walking_left_3.png"), assets.image("hero_walking_left_4.png"), assets.image("hero_walking_left_5.png"), assets.image("hero_walking_left_6.png"), assets.image("hero_walking_left_7.png"), assets.image("hero_walking_left_8.png"), assets.image("hero_walking_left_9.png")]
+        self.standing = [assets.image("hero_standing_1.png"), assets.image("hero_standing_2.png"), assets.image("hero_standing_3.png"), assets.image("hero_standing_4.png"), assets.image("hero_standing_5.png"), assets.image("hero_standing_6.png"), assets.image("hero_standing_7.png")]
+        self.bow_left = [assets.image("hero_bow_left_1.png"), assets.image("hero_bow_left_2.png"), assets.image("hero_bow_left_3.png"), assets.image("hero_bow_left_4.png"), assets.image("hero_bow_left_5.png"), assets.image("hero_bow_left_6.png"), assets.image("hero_bow_left_7.png"), assets.image("hero_bow_left_8.png"), assets.image("hero_bow_left_9.png"), assets.image("hero_bow_left_10.png"), assets.image("hero_bow_left_11.png"), assets.image("hero_bow_left_12.png"), assets.image("hero_bow_left_13.png")]       
+        self.bow_right = [assets.image("hero_bow_right_1.png"), assets.image("hero_bow_right_2.png"), assets.image("hero_bow_right_3.png"), assets.image("hero_bow_right_4.png"), assets.image("hero_bow_right_5.png"), assets.image("hero_bow_right_6.png"), assets.image("hero_bow_right_7.png"), assets.image("hero_bow_right_8.png"), assets.image("hero_bow_right_9.png"), assets.image("hero_bow_right_10.png"), assets.image("hero_bow_right_11.png"), assets.image("hero_bow_right_12.png"), assets.image("hero_bow_right_13.png")]
 
     def load_sounds(self):
         """Loads in sounds for hero sprite"""
-        self.jump = [pygame.mixer.Sound("jump_1.wav"), pygame.mixer.Sound("jump_2.wav")]
-        self.hit = pygame.mixer.Sound("hit.wav")
-        self.dead_sound = pygame.mixer.Sound("dead.wav")
+        # Heros sounds have their own channel, so they are never drowned out
+        self.jump = [assets.sound("jump_1.wav", HERO_CHANNEL), assets.sound("jump_2.wav", HERO_CHANNEL)]
+        self.hit = assets.sound("hit.wav", HERO_CHANNEL)
+        self.dead_sound = assets.sound("dead.wav", HERO_CHANNEL)
         
 class Orc(pygame.sprite.Sprite):
     """Orc enemy object"""
-    def __init__(self, x, y, game, spawner):
-        """Initiates Orc"""
+    def __init__(self, game):
+        """Initiates Orc (orcs come from the games orc pool and are placed in the level with reset)"""
         self.groups = game.all_sprites, game.orcs, game.enemies # Orc groups
         # Initiates the sprite class
-        pygame.sprite.Sprite.__init__(self, self.groups)
+        pygame.sprite.Sprite.__init__(self)
         self.game = game
         self.load_images()
         self.load_sounds()
-        self.position = vector(int(x * TILE_SIZE), int(y * TILE_SIZE))
-        self.velocity = vector(0, 0) 
+        self.position = vector(0, 0)
+        self.velocity = vector(0, 0)
+
+    def reset(self, x, y, spawner):
+        """Places the orc in the level, as if it was just created"""
+        self.add(self.groups)
+        self.position.update(int(x * TILE_SIZE), int(y * TILE_SIZE))
+        self.velocity.update(0, 0)
         self.image = self.walking_left[0]
+        self.mask = assets.mask(self.image) # Creates an image mask for collisions
         self.rect = self.image.get_rect()
         self.rect.x, self.rect.y = self.position
         self.health = 100
@@ -232,12 +277,13 @@ class Orc(pygame.sprite.Sprite):
         self.right = False
         self.spawner = spawner
         self.cooldown = 0
+        self.previous = self.rect.topleft # Not drawn moving from where it was last used
 
     def wall_collisions(self):
         """Checks if Orc collided with a wall"""
         # Falling
         if self.velocity.y > 0:
-            collisions = pygame.sprite.spritecollide(self, self.game.environment, False, pygame.sprite.collide_mask)
+            collisions = self.game.grid.collide(self, pygame.sprite.collide_mask)
             if collisions: # Checks if the orc had a collision
                 # Finds the lowest environment block the player collided with
                 lowest = collisions[0]
@@ -250,7 +296,7 @@ class Orc(pygame.sprite.Sprite):
 
         # Moving left or right
         if abs(self.velocity.x) > 0:
-                collisions = pygame.sprite.spritecollide(self, self.game.environment, False)
+                collisions = self.game.grid.collide(self)
                 if collisions: # Checks if the orc had a collision
                     # Finds the highest environment block the orc collided with
                     highest = collisions[0]
@@ -278,12 +324,16 @@ class Orc(pygame.sprite.Sprite):
         """Checks if the orc died"""
         #print(self.attack_cooldown, "die")
         if self.health <= 0:
-            self.game.enemies.remove(self)
-            self.game.orcs.remove(self)
-            self.game.all_sprites.remove(self)
+            self.kill()
             if self.spawner != None:
                 self.spawner.orcs.remove(self)
-            pygame.mixer.Sound.play(self.dead_sound)
+            self.dead_sound.play()
+
+    def kill(self):
+        """Removes the orc from the level and returns it to the orc pool"""
+        if self.alive():
+            pygame.sprite.Sprite.kill(self)
+            self.game.orc_pool.release(self)
 
     def move(self):
         """Moves orc sprite"""
@@ -322,7 +372,7 @@ class Orc(pygame.sprite.Sprite):
 
     def turn(self):
         """Checks if orc is going to walk off a platform"""
-        collisions = pygame.sprite.spritecollide(self, self.game.environment, False, pygame.sprite.collide_mask)
+        collisions = self.game.grid.collide(self, pygame.sprite.collide_mask)
         # If the orc is not collding with anything he must be falling
         if collisions:
             return False
@@ -346,8 +396,10 @@ class Orc(pygame.sprite.Sprite):
 
     def attack(self):
         """Attacks the player"""
-        # Attacks if the two sprite collide
-        collisions = pygame.sprite.spritecollide(self.game.hero, self.game.orcs, False, pygame.sprite.collide_mask)
+        # Attacks if the two sprite collide (the other orcs are only checked when this one touches the hero)
+        if not pygame.sprite.collide_mask(self.game.hero, self):
+            return
+        collisions = collide_masks(self.game.hero, self.game.orcs)
         if collisions:
             if collisions[0] == self:
                 collisions[0].cooldown = 1
@@ -363,12 +415,12 @@ class Orc(pygame.sprite.Sprite):
                         self.game.hero.armour -= 3
                     else:
                         self.game.hero.hearts -= 3
-                pygame.mixer.Sound.play(self.hit)
+                self.hit.play()
 
     def animation(self):
         """Animates the orc sprite"""
         #print(self.attack_cooldown, "ani")
-        current = pygame.time.get_ticks()
+        current = self.game.ticks
         if current - self.previous_U > 350: # Determines the animation speed
             self.previous_U = current
             self.frame_count = (self.frame_count + 1) % len(self.walking_left) # Calculates the current frame 
@@ -378,18 +430,18 @@ class Orc(pygame.sprite.Sprite):
             # Walking left
             else:
                 self.image = self.walking_left[self.frame_count]
-            self.mask = pygame.mask.from_surface(self.image)
+            self.mask = assets.mask(self.image)
 
     def load_images(self):
         """Loads in images for Orc sprite animation"""
-        self.walking_left = [pygame.image.load("orc_walking_left_1.png"), pygame.image.load("orc_walking_left_2.png"), pygame.image.load("orc_walking_left_3.png"), pygame.image.load("orc_walking_left_4.png"), pygame.image.load("orc_walking_left_5.png"), pygame.image.load("orc_walking_left_6.png"), pygame.image.load("orc_walking_left_7.png"), pygame.image.load("orc_walking_left_8.png"), pygame.image.load("orc_walking_left_9.png")]
-        self.walking_right = [pygame.image.load("orc_walking_right_1.png"), pygame.image.load("orc_walking_right_2.png"), pygame.image.load("orc_walking_right_3.png"), pygame.image.load("orc_walking_right_4.png"), pygame.image.load("orc_walking_right_5.png"), pygame.image.load("orc_walking_right_6.png"), pygame.image.load("orc_walking_right_7.png"), pygame.image.load("orc_walking_right_8.png"), pygame.image.load("orc_walking_right_9.png")]
-        self.dead = pygame.image.load("orc_dead_1.png")
+        self.walking_left = [assets.image("orc_walking_left_1.png"), assets.image("orc_walking_left_2.png"), assets.image("orc_walking_left_3.png"), assets.image("orc_walking_left_4.png"), assets.image("orc_walking_left_5.png"), assets.image("orc_walking_left_6.png"), assets.image("orc_walking_left_7.png"), assets.image("orc_walking_left_8.png"), assets.image("orc_walking_left_9.png")]
+        self.walking_right = [assets.image("orc_walking_right_1.png"), assets.image("orc_walking_right_2.png"), assets.image("orc_walking_right_3.png"), assets.image("orc_walking_right_4.png"), assets.image("orc_walking_right_5.png"), assets.image("orc_walking_right_6.png"), assets.image("orc_walking_right_7.png"), assets.image("orc_walking_right_8.png"), assets.image("orc_walking_right_9.png")]
+        self.dead = assets.image("orc_dead_1.png")
 
     def load_sounds(self):
         """Loads in sounds for orc"""
-        self.hit = pygame.mixer.Sound("hit.wav")
-        self.dead_sound = pygame.mixer.Sound("dead.wav")
+        self.hit = assets.sound("hit.wav")
+        self.dead_sound = assets.sound("dead.wav")
 
 class Fly(pygame.sprite.Sprite):
     """Fly enemy object"""
@@ -402,9 +454,10 @@ class Fly(pygame.sprite.Sprite):
         self.load_images()
         self.load_sounds()
         self.position = vector(int(x * TILE_SIZE), int(y * TILE_SIZE))
-        self.velocity = vector(random.choice([1, 1.5]), random.choice([1, 1.5]))
+        self.velocity = vector(self.game.random.choice([1, 1.5]), self.game.random.choice([1, 1.5]))
         self.acceleration = 0.2
         self.image = self.fly_left[0]
+        self.mask = assets.mask(self.image) # Creates an image mask for collisions
         self.rect = self.image.get_rect()
         self.rect.x, self.rect.y = self.position
         self.health = 200
@@ -435,8 +488,10 @@ class Fly(pygame.sprite.Sprite):
 
     def attack(self):
         """Attacks the player"""
-        # Attacks if the two sprite collide
-        collisions = pygame.sprite.spritecollide(self.game.hero, self.game.flies, False, pygame.sprite.collide_mask)
+        # Attacks if the two sprite collide (the other flies are only checked when this one touches the hero)
+        if not pygame.sprite.collide_mask(self.game.hero, self):
+            return
+        collisions = collide_masks(self.game.hero, self.game.flies)
         if collisions:
             if collisions[0] == self:
                 collisions[0].cooldown = 1
@@ -448,7 +503,7 @@ class Fly(pygame.sprite.Sprite):
                             self.game.hero.armour = 0
                     else:
                         self.game.hero.hearts -= 3
-                    pygame.mixer.Sound.play(self.hit)
+                    self.hit.play()
 
     def died(self):
         """Checks if the fly died"""
@@ -456,13 +511,13 @@ class Fly(pygame.sprite.Sprite):
             self.game.enemies.remove(self)
             self.game.flies.remove(self)
             self.game.all_sprites.remove(self)
-            pygame.mixer.Sound.play(self.dead_sound)
+            self.dead_sound.play()
 
     def move(self):
         """Moves the fly sprite"""
         # Moves towards the hero (player) if they are within a certain range
         if abs(self.game.hero.rect.midtop[0] - self.position.x) < 512 and abs(self.game.hero.rect.midtop[1] - self.position.y) < 256:
-            self.velocity = vector(random.choice([1, 1.5]), random.choice([1, 1.5]))
+            self.velocity = vector(self.game.random.choice([1, 1.5]), self.game.random.choice([1, 1.5]))
             # Moves to the right
             if self.game.hero.rect.midtop[0] > self.position.x:
                 self.position.x += self.velocity.x
@@ -496,7 +551,7 @@ class Fly(pygame.sprite.Sprite):
 
     def animation(self):
         """Animates the fly sprite"""
-        current = pygame.time.get_ticks()
+        current = self.game.ticks
         if current - self.previous_U > 150: # Determines animation speed
             self.previous_U = current
             self.frame_count = (self.frame_count + 1) % len(self.fly_left) # Calculates the current frame
@@ -506,17 +561,18 @@ class Fly(pygame.sprite.Sprite):
             # Moving left
             else:
                 self.image = self.fly_left[self.frame_count]
+            self.mask = assets.mask(self.image)
 
     def load_images(self):
         """Loads in images for fly animation"""
-        self.fly_right = [pygame.image.load("fly_right_1.png"), pygame.image.load("fly_right_2.png")]
-        self.fly_left = [pygame.image.load("fly_left_1.png"), pygame.image.load("fly_left_2.png")]
-        self.fly_dead = [pygame.image.load("fly_right_dead.png"), pygame.image.load("fly_left_dead.png")]
+        self.fly_right = [assets.image("fly_right_1.png"), assets.image("fly_right_2.png")]
+        self.fly_left = [assets.image("fly_left_1.png"), assets.image("fly_left_2.png")]
+        self.fly_dead = [assets.image("fly_right_dead.png"), assets.image("fly_left_dead.png")]
 
     def load_sounds(self):
         """Loads in sounds for fly"""
-        self.hit = pygame.mixer.Sound("hit.wav")
-        self.dead_sound = pygame.mixer.Sound("dead.wav")
+        self.hit = assets.sound("hit.wav")
+        self.dead_sound = assets.sound("dead.wav")
 
 class Spawner(pygame.sprite.Sprite):
     """ Orc spawner object"""
@@ -544,13 +600,13 @@ class Spawner(pygame.sprite.Sprite):
         # Only two orcs can be alive at any one time
         if len(self.orcs) < 2: 
             self.spawning = True
-            return Orc(self.rect.x / TILE_SIZE, self.rect.y / TILE_SIZE, self.game, self)
+            return self.game.orc_pool.get(self.rect.x / TILE_SIZE, self.rect.y / TILE_SIZE, self)
 
     def animation(self):
         """Animates the orc sprite"""
         # If an orc is being spawned
         if self.spawning:
-            current = pygame.time.get_ticks()
+            current = self.game.ticks
             self.image = self.tunnel[1]
             if current - self.previous_U > 10000: # Door stays open for a short time after an orc is spawned
                 self.previous_U = current
@@ -561,13 +617,13 @@ class Spawner(pygame.sprite.Sprite):
 
     def load_images(self):
         """Loads in images for spawner animation"""
-        self.tunnel = [pygame.image.load("tunnel_closed.png"), pygame.image.load("tunnel_open.png")]
+        self.tunnel = [assets.image("tunnel_closed.png"), assets.image("tunnel_open.png")]
 
 class Environment(pygame.sprite.Sprite):
     """Environmental blocks (terrian)"""
     def __init__(self, x, y, type, game):
         """Initiates environment block"""
-        self.groups = game.all_sprites, game.environment # Environment block groups
+        self.groups = game.environment # Environment block groups (never updated, so not in all_sprites)
         # Initiates sprite class
         pygame.sprite.Sprite.__init__(self, self.groups)
         self.game = game
@@ -591,6 +647,7 @@ class Environment(pygame.sprite.Sprite):
         elif type == "la":
             self.image = self.ladder
         self.type = type
+        self.mask = assets.mask(self.image) # Creates an image mask for collisions
         self.rect = self.image.get_rect()
         self.rect.x = self.x * TILE_SIZE
         self.rect.y = self.y * TILE_SIZE
@@ -599,32 +656,39 @@ class Environment(pygame.sprite.Sprite):
 
     def load_images(self):
         """Loads in images for the environment blocks"""
-        self.grass = [pygame.image.load("grass_1.png"), pygame.image.load("grass_2.png"), pygame.image.load("grass_3.png"), pygame.image.load("half.png")]
-        self.dirt = pygame.image.load("dirt.png")
-        self.lava = [pygame.image.load("lava_1.png"), pygame.image.load("lava_2.png"), pygame.image.load("lava_3.png")]
-        self.water = pygame.image.load("water.png")
+        self.grass = [assets.tile("grass_1.png"), assets.tile("grass_2.png"), assets.tile("grass_3.png"), assets.tile("half.png")]
+        self.dirt = assets.tile("dirt.png")
+        self.lava = [assets.tile("lava_1.png"), assets.tile("lava_2.png"), assets.tile("lava_3.png")]
+        self.water = assets.tile("water.png")
 
 class Arrow(pygame.sprite.Sprite):
     """Arrow object"""
-    def __init__(self, direction, game):
-        # Initiates arrow
+    def __init__(self, game):
+        """Initiates arrow (arrows come from the games arrow pool and are shot with reset)"""
         self.groups = game.all_sprites, game.arrows # Arrow groups
         # Initiates sprite class
-        pygame.sprite.Sprite.__init__(self, self.groups)
+        pygame.sprite.Sprite.__init__(self)
         self.game = game
         self.load_images()
+        self.velocity = vector(0, 0)
+        self.acceleration = vector(0, 0)
+        self.damage = 100
+
+    def reset(self, direction):
+        """Shoots the arrow from the hero, as if it was just created"""
+        self.add(self.groups)
         if direction == "r":
             self.image = self.right_arrow
         if direction == "l":
             self.image = self.left_arrow
         self.position = self.game.hero.rect.center
         self.direction = direction
-        self.velocity = vector(0, 0)
-        self.acceleration = vector(0,0)
+        self.velocity.update(0, 0)
+        self.acceleration.update(0, 0)
         self.rect = self.image.get_rect()
         self.start_timer = 0
-        self.damage = 100
         self.hit = False
+        self.previous = self.rect.topleft # Not drawn moving from where it was last used
 
     def update(self):
         """Updates arrow sprite"""
@@ -662,7 +726,7 @@ class Arrow(pygame.sprite.Sprite):
     
     def hit_wall(self):
         """Checks if the arrow hit a wall"""
-        collisions = pygame.sprite.spritecollide(self, self.game.environment, False)
+        collisions = self.game.grid.collide(self)
         # Hit a wall
         if collisions:
             # Moving right
@@ -678,13 +742,19 @@ class Arrow(pygame.sprite.Sprite):
         """Removes arrow from sprite groups"""
         # If the arrow hit a object or is off the map
         if self.rect.centerx  > self.game.map.width or self.rect.centerx < 0 or self.hit == True:
-            self.game.arrows.remove(self)
-            self.game.all_sprites.remove(self)
+            self.kill()
+
+    def kill(self):
+        """Removes the arrow from the level and returns it to the arrow pool"""
+        # Arrows can be removed more than once in an update, but only go back to the pool once
+        if self.alive():
+            pygame.sprite.Sprite.kill(self)
+            self.game.arrow_pool.release(self)
 
     def load_images(self):
         """Loads in arrow images"""
-        self.right_arrow = pygame.image.load("arrow_right.png")
-        self.left_arrow = pygame.image.load("arrow_left.png")
+        self.right_arrow = assets.image("arrow_right.png")
+        self.left_arrow = assets.image("arrow_left.png")
 
 class Jump_Pad(pygame.sprite.Sprite):
     """Jump pad object"""
@@ -703,7 +773,7 @@ class Jump_Pad(pygame.sprite.Sprite):
         self.rect.y = self.y * TILE_SIZE
         self.jumping = False
         self.previous_U = 0
-        self.mask = pygame.mask.from_surface(self.image)
+        self.mask = assets.mask(self.image)
 
     def update(self):
         """Updates the jump pad sprite"""
@@ -713,7 +783,7 @@ class Jump_Pad(pygame.sprite.Sprite):
         """Animates the jump pad"""
         # If the jump pad is being used 
         if self.jumping:
-            current = pygame.time.get_ticks()
+            current = self.game.ticks
             self.image = self.jump_pad[1]
             if current - self.previous_U > 5500: # Jump pad is extended for a short time after it is used
                 self.previous_U = current
@@ -724,7 +794,7 @@ class Jump_Pad(pygame.sprite.Sprite):
 
     def can_jump(self):
         """Checks if the hero (player) can use the jump pad"""
-        collisions = pygame.sprite.spritecollide(self.game.hero, self.game.jump_pads, False, pygame.sprite.collide_mask)
+        collisions = collide_masks(self.game.hero, self.game.jump_pads)
         # Is standing on jump pad
         if collisions: 
             collisions[0].jumping = True
@@ -733,13 +803,13 @@ class Jump_Pad(pygame.sprite.Sprite):
 
     def load_images(self):
         """Loads in images for the jump pad animation"""
-        self.jump_pad = [pygame.image.load("jump_pad_1.png"), pygame.image.load("jump_pad_2.png")]
+        self.jump_pad = [assets.image("jump_pad_1.png"), assets.image("jump_pad_2.png")]
 
 class Spikes(pygame.sprite.Sprite):
     """Spike object"""
     def __init__(self, x, y, game):
         """Initiates Spike"""
-        self.groups = game.all_sprites, game.spikes # Spike groups
+        self.groups = game.spikes # Spike groups (never updated, so not in all_sprites)
         # Initiates sprite class
         pygame.sprite.Sprite.__init__(self, self.groups)
         self.game = game
@@ -752,30 +822,23 @@ class Spikes(pygame.sprite.Sprite):
         self.rect = self.image.get_rect()
         self.rect.x, self.rect.y = self.position
         # Creates an image mask for collisions
-        self.mask = pygame.mask.from_surface(self.image)
-
-    def update(self):
-        """Updates the spike sprite"""
-        self.spike_hit()
+        self.mask = assets.mask(self.image)
 
     def spike_hit(self):
-        """Checks if the player landed on a spike"""
-        collisions = pygame.sprite.spritecollide(self.game.hero, self.game.spikes, False, pygame.sprite.collide_mask)
-        # Landed on a spike
-        if collisions:
-            # Deals damage
-            # Armour does not block it
-            if self.game.difficulty == "normal" or self.game.difficulty == "impossible":
-                self.game.hero.hearts -= 3
-                pygame.mixer.Sound.play(self.hit)
+        """Hurts the player after they landed on the spike (checked once per frame by the game)"""
+        # Deals damage
+        # Armour does not block it
+        if self.game.difficulty == "normal" or self.game.difficulty == "impossible":
+            self.game.hero.hearts -= 3
+            self.hit.play()
 
     def load_images(self):
         """Loads in image for the spikes"""
-        self.spikes = pygame.image.load("spikes.png")
+        self.spikes = assets.tile("spikes.png")
 
     def load_sounds(self):
         """Loads in sounds for fly"""
-        self.hit = pygame.mixer.Sound("hit.wav")
+        self.hit = assets.sound("hit.wav")
 
 class Key(pygame.sprite.Sprite):
     """Key object"""
@@ -788,36 +851,25 @@ class Key(pygame.sprite.Sprite):
         self.load_images()
         self.load_sounds()
         self.image = self.key
-        # Makes the image smaller
-        self.image = pygame.transform.scale(self.image, (40, 40))
         self.position = vector(int(x * TILE_SIZE + 17), int(y * TILE_SIZE + 17))
         self.rect = self.image.get_rect()
         self.rect.x, self.rect.y = self.position
         # Creates an image mask for collisions
-        self.mask = pygame.mask.from_surface(self.image)
-
-    def update(self):
-        """Updates the key sprite"""
-        self.grab_key()
+        self.mask = assets.mask(self.image)
 
     def grab_key(self):
-        """Checks if the hero can pick up the key"""
-        collisions = pygame.sprite.spritecollide(self.game.hero, self.game.keys, False, pygame.sprite.collide_mask)
-        # Can pick up the key
-        if collisions:
-            # Gives hero object the key
-            self.game.hero.keys.append(collisions[0])
-            self.game.keys.remove(collisions[0])
-            self.game.all_sprites.remove(collisions[0])
-            pygame.mixer.Sound.play(self.sound_pu)
+        """Gives the key to the hero after they picked it up (checked once per frame by the game)"""
+        self.game.hero.keys.append(self)
+        self.sound_pu.play()
 
     def load_images(self):
         """Loads in image for the key"""
-        self.key = pygame.image.load("key_1.png")
+        # Image is made smaller
+        self.key = assets.scaled("key_1.png", (40, 40))
 
     def load_sounds(self):
         """Loads in sounds for the key"""
-        self.sound_pu = pygame.mixer.Sound("coin_sound.wav")
+        self.sound_pu = assets.sound("coin_sound.wav")
 
 class Door(pygame.sprite.Sprite):
     """Door object"""
@@ -868,7 +920,7 @@ class Door(pygame.sprite.Sprite):
 
     def load_images(self):
         """Loads in images for the door animation"""
-        self.door = [pygame.image.load("door_closed.png"), pygame.image.load("door_open.png")]
+        self.door = [assets.image("door_closed.png"), assets.image("door_open.png")]
 
 class Coin(pygame.sprite.Sprite):
     """Coin object"""
@@ -884,7 +936,7 @@ class Coin(pygame.sprite.Sprite):
         self.load_sounds()
         self.position = vector(int(x * TILE_SIZE + 17), int(y * TILE_SIZE + 17))
         self.image = self.coin[0]
-        self.image = pygame.transform.scale(self.image, (30, 30))
+        self.mask = assets.mask(self.image) # Creates an image mask for collisions
         self.rect = self.image.get_rect()
         self.rect.x, self.rect.y = self.position
         self.up = True
@@ -894,44 +946,38 @@ class Coin(pygame.sprite.Sprite):
     
     def update(self):
         """Updates coin sprite"""
-        self.pick_up()
         self.animation()
 
     def animation(self):
         """Animates coin sprite"""
-        current = pygame.time.get_ticks()
+        current = self.game.ticks
         if current - self.previous_U > 100: # Animation speed
             self.previous_U = current
             self.frame_count = (self.frame_count + 1) % len(self.coin) # Calculates the current frame 
             self.image = self.coin[self.frame_count]
-            self.image = pygame.transform.scale(self.image, (30, 30)) # Makes the image smaller
-            self.mask = pygame.mask.from_surface(self.image) # Creates an image mask for collisions
+            self.mask = assets.mask(self.image) # Creates an image mask for collisions
 
     def pick_up(self):
-        """Checks if the hero can pick up the coin"""
-        collisions = pygame.sprite.spritecollide(self.game.hero, self.game.coins, False, pygame.sprite.collide_mask)
-        # Player is standing on the coin
-        if collisions:
-            # Hero gets the coin
-            if self.game.difficulty == "impossible":
-                coin = random.randint(1, 2)
-                if coin == 1:
-                    self.game.hero.coins += 1
-            else:
-                self.game.hero.coins += 1 * self.game.hero.difficulty_multiplier
-            if self.game.hero.coins > self.game.hero.max_coins:
-                self.game.hero.coins = self.game.hero.max_coins
-            pygame.mixer.Sound.play(self.coin_sound)
-            self.game.all_sprites.remove(collisions[0])
-            self.game.coins.remove(collisions[0])
+        """Gives the coin to the hero after they picked it up (checked once per frame by the game)"""
+        # Hero gets the coin
+        if self.game.difficulty == "impossible":
+            coin = self.game.random.randint(1, 2)
+            if coin == 1:
+                self.game.hero.coins += 1
+        else:
+            self.game.hero.coins += 1 * self.game.hero.difficulty_multiplier
+        if self.game.hero.coins > self.game.hero.max_coins:
+            self.game.hero.coins = self.game.hero.max_coins
+        self.coin_sound.play()
 
     def load_images(self):
         """Loads in images for coin animation"""
-        self.coin = [pygame.image.load("coin_1.png"), pygame.image.load("coin_2.png"), pygame.image.load("coin_3.png"), pygame.image.load("coin_4.png"), pygame.image.load("coin_5.png"), pygame.image.load("coin_6.png")]
+        # Images are made smaller
+        self.coin = [assets.scaled("coin_1.png", (30, 30)), assets.scaled("coin_2.png", (30, 30)), assets.scaled("coin_3.png", (30, 30)), assets.scaled("coin_4.png", (30, 30)), assets.scaled("coin_5.png", (30, 30)), assets.scaled("coin_6.png", (30, 30))]
 
     def load_sounds(self):
         """Loads in coin sounds"""
-        self.coin_sound = pygame.mixer.Sound("coin_sound.wav")
+        self.coin_sound = assets.sound("coin_sound.wav")
 
 # Town classes (For when the hero is in the town)
 
@@ -956,7 +1002,7 @@ class Town_Hero(pygame.sprite.Sprite):
         self.left = False
         self.up = False
         self.down = False
-        self.mask = pygame.mask.from_surface(self.image) # Creates an image mask for collisions
+        self.mask = assets.mask(self.image) # Creates an image mask for collisions
 
     def update(self):
         """Updates hero sprite"""
@@ -968,7 +1014,7 @@ class Town_Hero(pygame.sprite.Sprite):
     def get_keys(self):
         """Gets key events from the user"""
         self.acceleration = vector(0, 0)
-        KEYS = pygame.key.get_pressed()
+        KEYS = self.town.game.pressed # Keys read by the game for this update
         # Moving left
         if KEYS[pygame.K_LEFT] or KEYS[pygame.K_a]: 
             self.acceleration.x = -ACC
@@ -1012,7 +1058,7 @@ class Town_Hero(pygame.sprite.Sprite):
     
     def animation(self):
         """Animates the hero sprite"""
-        current = pygame.time.get_ticks()
+        current = self.town.game.ticks
         # Checks if the player is running
         if current - self.previous_U > 150: # Animation speed
             self.previous_U = current
@@ -1031,7 +1077,7 @@ class Town_Hero(pygame.sprite.Sprite):
                 self.image = self.walking_up[self.frame_count]
             
         # Creates an image mask for collisions
-        self.mask = pygame.mask.from_surface(self.image)
+        self.mask = assets.mask(self.image)
 
     def collision(self, direction):
         """Checks for collisions (if the player went off the dirt track)"""
@@ -1056,14 +1102,14 @@ class Town_Hero(pygame.sprite.Sprite):
 
     def load_images(self):
         """Loads in images for hero sprite animation"""
-        self.walking_right = [pygame.image.load("hero_walking_right_1.png"), pygame.image.load("hero_walking_right_2.png"), pygame.image.load("hero_walking_right_3.png"), pygame.image.load("hero_walking_right_4.png"), pygame.image.load("hero_walking_right_5.png"), pygame.image.load("hero_walking_right_6.png"), pygame.image.load("hero_walking_right_7.png"), pygame.image.load("hero_walking_right_8.png"), pygame.image.load("hero_walking_right_9.png")]
-        self.walking_left = [pygame.image.load("hero_walking_left_1.png"), pygame.image.load("hero_walking_left_2.png"), pygame.image.load("hero_walking_left_3.png"), pygame.image.load("hero_walking_left_4.png"), pygame.image.load("hero_walking_left_5.png"), pygame.image.load("hero_walking_left_6.png"), pygame.image.load("hero_walking_left_7.png"), pygame.image.load("hero_walking_left_8.png"), pygame.image.load("hero_walking_left_9.png")]
-        self.walking_up = [pygame.image.load("hero_walking_up_1.png"), pygame.image.load("hero_walking_up_2.png"), pygame.image.load("hero_walking_up_3.png"), pygame.image.load("hero_walking_up_4.png"), pygame.image.load("hero_walking_up_5.png"), pygame.image.load("hero_walking_up_6.png"), pygame.image.load("hero_walking_up_7.png"), pygame.image.load("hero_walking_up_8.png"), pygame.image.load("hero_walking_up_9.png")]
-        self.walking_down = [pygame.image.load("hero_walking_down_1.png"), pygame.image.load("hero_walking_down_2.png"), pygame.image.load("hero_walking_down_3.png"), pygame.image.load("hero_walking_down_4.png"), pygame.image.load("hero_walking_down_5.png"), pygame.image.load("hero_walking_down_6.png"), pygame.image.load("hero_walking_down_7.png"), pygame.image.load("hero_walking_down_8.png"), pygame.image.load("hero_walking_down_9.png")]
+        self.walking_right = [assets.image("hero_walking_right_1.png"), assets.image("hero_walking_right_2.png"), assets.image("hero_walking_right_3.png"), assets.image("hero_walking_right_4.png"), assets.image("hero_walking_right_5.png"), assets.image("hero_walking_right_6.png"), assets.image("hero_walking_right_7.png"), assets.image("hero_walking_right_8.png"), assets.image("hero_walking_right_9.png")]
+        self.walking_left = [assets.image("hero_walking_left_1.png"), assets.image("hero_walking_left_2.png"), assets.image("hero_walking_left_3.png"), assets.image("hero_walking_left_4.png"), assets.image("hero_walking_left_5.png"), assets.image("hero_walking_left_6.png"), assets.image("hero_walking_left_7.png"), assets.image("hero_walking_left_8.png"), assets.image("hero_walking_left_9.png")]
+        self.walking_up = [assets.image("hero_walking_up_1.png"), assets.image("hero_walking_up_2.png"), assets.image("hero_walking_up_3.png"), assets.image("hero_walking_up_4.png"), assets.image("hero_walking_up_5.png"), assets.image("hero_walking_up_6.png"), assets.image("hero_walking_up_7.png"), assets.image("hero_walking_up_8.png"), assets.image("hero_walking_up_9.png")]
+        self.walking_down = [assets.image("hero_walking_down_1.png"), assets.image("hero_walking_down_2.png"), assets.image("hero_walking_down_3.png"), assets.image("hero_walking_down_4.png"), assets.image("hero_walking_down_5.png"), assets.image("hero_walking_down_6.png"), assets.image("hero_walking_down_7.png"), assets.image("hero_walking_down_8.png"), assets.image("hero_walking_down_9.png")]
 
     def load_sounds(self):
         """Loads in sounds for hero sprite"""
-        self.footsteps = pygame.mixer.Sound("Footsteps.wav")
+        self.footsteps = assets.sound("Footsteps.wav")
 
 class Town_Terrain(pygame.sprite.Sprite):
     """Town environment"""
@@ -1104,8 +1150,8 @@ class Town_Terrain(pygame.sprite.Sprite):
 
     def load_images(self):
         """Loads in images for town environment"""
-        self.grass = pygame.image.load("town_grass.png")
-        self.water = [pygame.image.load("water_tl.png"), pygame.image.load("water_tm.png"), pygame.image.load("water_tr.png"), pygame.image.load("water_ml.png"), pygame.image.load("water_mm.png"), pygame.image.load("water_mr.png"), pygame.image.load("water_bl.png"), pygame.image.load("water_bm.png"), pygame.image.load("water_br.png")]
+        self.grass = assets.tile("town_grass.png")
+        self.water = [assets.tile("water_tl.png"), assets.tile("water_tm.png"), assets.tile("water_tr.png"), assets.tile("water_ml.png"), assets.tile("water_mm.png"), assets.tile("water_mr.png"), assets.tile("water_bl.png"), assets.tile("water_bm.png"), assets.tile("water_br.png")]
 
 class Decorations(pygame.sprite.Sprite):
     """Decorations in the town"""
@@ -1131,7 +1177,7 @@ class Decorations(pygame.sprite.Sprite):
 
     def load_images(self):
         """Loads in images for decoration objects"""
-        self.bush = [pygame.image.load("bush_1.png"), pygame.image.load("bush_2.png"), pygame.image.load("bush_3.png")]
+        self.bush = [assets.tile("bush_1.png"), assets.tile("bush_2.png"), assets.tile("bush_3.png")]
 
 class Town_Path(pygame.sprite.Sprite):
     """Town path"""
@@ -1168,7 +1214,7 @@ class Town_Path(pygame.sprite.Sprite):
         self.rect.y = self.y * TILE_SIZE
 
     def load_images(self):
-        self.dirt = [pygame.image.load("dirt_tl.png"), pygame.image.load("dirt_tm.png"), pygame.image.load("dirt_tr.png"), pygame.image.load("dirt_ml.png"), pygame.image.load("dirt_mm.png"), pygame.image.load("dirt_mr.png"), pygame.image.load("dirt_bl.png"), pygame.image.load("dirt_bm.png"), pygame.image.load("dirt_br.png")]
+        self.dirt = [assets.tile("dirt_tl.png"), assets.tile("dirt_tm.png"), assets.tile("dirt_tr.png"), assets.tile("dirt_ml.png"), assets.tile("dirt_mm.png"), assets.tile("dirt_mr.png"), assets.tile("dirt_bl.png"), assets.tile("dirt_bm.png"), assets.tile("dirt_br.png")]
 
 class Town_Door(pygame.sprite.Sprite):
     """Door to move into the platformer level"""
@@ -1183,7 +1229,7 @@ class Town_Door(pygame.sprite.Sprite):
         self.position = vector(int(x * TILE_SIZE), int(y * TILE_SIZE))
         self.rect = self.image.get_rect()
         self.rect.x, self.rect.y = self.position
-        self.mask = pygame.mask.from_surface(self.image) # Creates an image mask for collisions
+        self.mask = assets.mask(self.image) # Creates an image mask for collisions
 
     def update(self):
         """Updates the town door"""
@@ -1210,8 +1256,8 @@ class Town_Door(pygame.sprite.Sprite):
 
     def load_images(self):
         """Loads in iamges for door animation"""
-        self.open = pygame.image.load("town_door_open.png")
-        self.closed = pygame.image.load("town_door_closed.png")
+        self.open = assets.image("town_door_open.png")
+        self.closed = assets.image("town_door_closed.png")
 
 class Town_Shop(pygame.sprite.Sprite):
     """Shops in which player can buy upgrades"""
@@ -1238,7 +1284,7 @@ class Town_Shop(pygame.sprite.Sprite):
         self.rect = self.image.get_rect()
         self.rect.x, self.rect.y = self.position
         self.previous_U = 0
-        self.mask = pygame.mask.from_surface(self.image) # Creates an image mask for collisions
+        self.mask = assets.mask(self.image) # Creates an image mask for collisions
 
     def update(self):
         self.animation()
@@ -1262,7 +1308,40 @@ class Town_Shop(pygame.sprite.Sprite):
                 return True
         return False
 
+    def buy(self, item):
+        """Buys armour or medicine for the hero, returns False if the items button should turn red"""
+        hero = self.town.game.hero
+        if self.town.game.recorder != None:
+            self.town.game.recorder.buy(item)
+        if item == "armour":
+            # Checks if the player has enough gold
+            if hero.coins >= int(5 / hero.difficulty_multiplier):
+                # Checks if the player has max armour
+                if hero.armour < hero.max_armour:
+                    hero.armour += 1
+                    hero.coins -= int(5 / hero.difficulty_multiplier)
+                return True
+            # Player cannot afford the armour
+            return False
+        # Checks if the player can afford the medicine and does not already have max hearts
+        if hero.coins >= int(10 / hero.difficulty_multiplier) and hero.hearts < 3:
+            hero.hearts = 3
+            hero.coins -= int(10 / hero.difficulty_multiplier)
+            return True
+        return False
+
     def shop(self):
+        """Shop screen, the player buys upgrades with the mouse until they press escape"""
+        if self.town.game.recorder != None:
+            self.town.game.recorder.visit_shop()
+        # Replays buy the recorded items and headless games can not click, so neither waits on the shop screen
+        if self.town.game.replay != None or self.town.game.headless:
+            if self.town.game.replay != None:
+                for item in self.town.game.replay.visit_shop():
+                    self.buy(item)
+            self.town.game.dirty.redraw()
+            self.town.hero.rect.y += 64
+            return
         shopping = True
         # Creates shop screen
         screen_outline = pygame.draw.rect(self.town.game.screen, BLACK, ((WIDTH / 2) - WIDTH / 3, HEIGHT / 5, WIDTH / 1.5, HEIGHT / 1.5), 0)        
@@ -1273,16 +1352,21 @@ class Town_Shop(pygame.sprite.Sprite):
             self.armour = Button(GREY[0], WIDTH / 2, (HEIGHT / 3) + 35, 200, 50, "Armour: " + str(int(5 / self.town.game.hero.difficulty_multiplier)) + " gold", 25, self.town.game)
             self.health = Button(GREY[0], WIDTH / 2, (HEIGHT / 2) + 35, 200, 50, "Medicine: " + str(int(10 / self.town.game.hero.difficulty_multiplier)) + " gold" , 25, self.town.game)
             self.coins = Button(GREY[0], WIDTH / 2, (HEIGHT / 1.5) + 35, 200, 50, "Your Coins: " + str(int(self.town.game.hero.coins)), 25, self.town.game)
+            self.town.game.dirty.redraw()
+            changed = True
             # Continues until the player leaves the shop
             while shopping:
                 # Position of the mouse
                 position = pygame.mouse.get_pos()
-                # Draws buttons
-                self.shop_heading.draw(self.town.game.screen)
-                self.armour.draw(self.town.game.screen)
-                self.health.draw(self.town.game.screen)
-                self.coins.draw(self.town.game.screen)
-                pygame.display.update()
+                # Buttons are only drawn again when the mouse did something
+                if changed:
+                    self.town.game.dirty.add(self.shop_heading.draw(self.town.game.screen))
+                    self.town.game.dirty.add(self.armour.draw(self.town.game.screen))
+                    self.town.game.dirty.add(self.health.draw(self.town.game.screen))
+                    self.town.game.dirty.add(self.coins.draw(self.town.game.screen))
+                    self.town.game.dirty.update()
+                    changed = False
+                self.town.clock.tick(FPS)
                 
                 for event in pygame.event.get():
                     # Checks if the player wants to quit
@@ -1294,35 +1378,19 @@ class Town_Shop(pygame.sprite.Sprite):
                             shopping = False
                     # If the mouse button was pressed
                     if event.type == pygame.MOUSEBUTTONDOWN:
-                        # Is over the armour button
+                        changed = True
+                        # Is over the armour button (turns red when the player cannot afford the armour)
                         if self.armour.mouse_over(position):
-                            # Checks if the player has enough gold
-                            if self.town.game.hero.coins >= int(5 / self.town.game.hero.difficulty_multiplier):
-                                # Checks if the player has max armour
-                                if self.town.game.hero.armour < self.town.game.hero.max_armour:
-                                    self.town.game.hero.armour += 1
-                                    self.town.game.hero.coins -= int(5 / self.town.game.hero.difficulty_multiplier)
-                                    self.coins.text = "Your Coins: " + str(int(self.town.game.hero.coins))
-                            # Turns red when the player cannot afford the armour
-                            else:
+                            if not self.buy("armour"):
                                 self.armour.colour = RED
-                        # Is over the medicine button
+                        # Is over the medicine button (turns red when the player cannot afford it or has max hearts)
                         if self.health.mouse_over(position):
-                            # Checks if the player can afford the medicine
-                            if self.town.game.hero.coins >= int(10 / self.town.game.hero.difficulty_multiplier):
-                                # Checks if the player already has max hearts
-                                if self.town.game.hero.hearts < 3:
-                                    self.town.game.hero.hearts = 3
-                                    self.town.game.hero.coins -= int(10 / self.town.game.hero.difficulty_multiplier)
-                                    self.coins.text = "Your Coins: " + str(int(self.town.game.hero.coins))
-                                # Button turns red if the player has max health
-                                else:
-                                    self.health.colour = RED
-                            # Button turns red when the player cannot afford the armour
-                            else:
+                            if not self.buy("medicine"):
                                 self.health.colour = RED
+                        self.coins.text = "Your Coins: " + str(int(self.town.game.hero.coins))
                     # Mouse has moved
                     if event.type == pygame.MOUSEMOTION:
+                            changed = True
                             # If the mouse is over the armour button
                             if self.armour.mouse_over(position) and self.armour.colour != RED:
                                 self.armour.colour = GREY[1]
@@ -1337,9 +1405,11 @@ class Town_Shop(pygame.sprite.Sprite):
         else:
             # Reminds the player that they are bad (in a nice way)
             self.message = Button(GREY[0], WIDTH / 2, HEIGHT / 2, 200, 80, "YOU'RE INVINCIBLE", 25, self.town.game)
+            self.message.draw(self.town.game.screen)
+            self.town.game.dirty.redraw()
+            self.town.game.dirty.update()
             while shopping:
-                self.message.draw(self.town.game.screen)
-                pygame.display.update()
+                self.town.clock.tick(FPS)
                 
                 for event in pygame.event.get():
                     if event.type == pygame.QUIT:
@@ -1349,10 +1419,13 @@ class Town_Shop(pygame.sprite.Sprite):
                         if event.key == pygame.K_ESCAPE:
                             shopping = False
             
-
+        # Time spent in the shop is not caught up on when the town starts updating again
+        self.town.clock.tick()
+        # The town is drawn over the whole shop screen
+        self.town.game.dirty.redraw()
         self.town.hero.rect.y += 64
 
     def load_images(self):
         """loads in images for building tiles"""
-        self.building = [pygame.image.load("roof_f.png"), pygame.image.load("roof_m.png"), pygame.image.load("roof_b.png"), pygame.image.load("roof_tile.png"), pygame.image.load("door_frame.png")]
-        self.door = [pygame.image.load("building_door_closed.png"), pygame.image.load("building_door_open.png")]
\ No newline at end of file
+        self.building = [assets.tile("roof_f.png"), assets.tile("roof_m.png"), assets.tile("roof_b.png"), assets.tile("roof_tile.png"), assets.tile("door_frame.png")]
+        self.door = [assets.image("building_door_closed.png"), assets.image("building_door_open.png")]
\ No newline at end of file
@@ -0,0 +1,73 @@
+# Platformer replay tests (run with python -m pytest)
+
+# Imports required modules
+import os
+import random
+import pygame
+# Images and sounds are loaded from the repository folder
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+# Imports other game files
+from Platformer_Main import *
+
+def keyboard(seed):
+    """Returns a fake pygame.key.get_pressed that holds random keys for a while at a time (mostly moving right)"""
+    generator = random.Random(seed)
+    held = set()
+    def get_pressed():
+        if generator.random() < 0.1:
+            held.clear()
+            for key, chance in ((pygame.K_LEFT, 0.2), (pygame.K_RIGHT, 0.6), (pygame.K_UP, 0.4), (pygame.K_LSHIFT, 0.4)):
+                if generator.random() < chance:
+                    held.add(key)
+        return dict((key, key in held) for key in RECORDED_KEYS)
+    return get_pressed
+
+def state(game):
+    """Returns the parts of a game that a replay must reproduce"""
+    hero = game.hero
+    return (game.level, game.ticks, tuple(hero.rect), hero.coins, hero.hearts, hero.armour, hero.dead, len(game.arrows), len(game.coins),
+            sorted(tuple(orc.rect) for orc in game.orcs))
+
+def test_replay_reproduces_level(tmp_path, monkeypatch):
+    """A recorded level plays back to exactly the same state (this run picks up coins, fights orcs and dies)"""
+    monkeypatch.setattr(pygame.key, "get_pressed", keyboard(4))
+    game = Game(headless=True, seed=7)
+    game.record()
+    game.load_level()
+    game.step(3000)
+    game.recorder.save(str(tmp_path / "run.abjr"))
+    recorded = state(game)
+
+    # Keyboard is not read while a replay plays
+    monkeypatch.setattr(pygame.key, "get_pressed", keyboard(5))
+    game = Game(headless=True)
+    game.play_replay(str(tmp_path / "run.abjr"))
+    game.load_level()
+    game.step(3000)
+    assert state(game) == recorded
+
+def test_replay_reproduces_shop(tmp_path):
+    """Items bought in the shop are bought again when the replay reaches the shop"""
+    game = Game(headless=True, seed=7)
+    game.record()
+    game.load_level()
+    game.hero.coins = 20
+    game.hero.hearts = 1
+    town = Town(game)
+    town.load()
+    game.recorder.visit_shop()
+    for item in ["armour", "medicine", "armour"]:
+        town.shop.buy(item)
+    game.recorder.save(str(tmp_path / "shop.abjr"))
+    bought = (game.hero.coins, game.hero.hearts, game.hero.armour)
+
+    game = Game(headless=True)
+    game.play_replay(str(tmp_path / "shop.abjr"))
+    game.load_level()
+    game.hero.coins = 20
+    game.hero.hearts = 1
+    town = Town(game)
+    town.load()
+    town.shop.shop() # Does not wait for the mouse
+    assert (game.hero.coins, game.hero.hearts, game.hero.armour) == bought
+    assert bought != (20, 1, 0)